@@ -24,8 +24,7 @@ from geospatial_analysis import geospatial_analyzer
 from token_visualization import token_viz_engine
 from location_manager import location_manager
 from auth import login_required, authenticate_user, login_user, logout_user, get_current_user
-from db import init_db, save_token, save_transaction, get_conn
-from werkzeug.security import generate_password_hash
+from db import init_db, save_token, save_transaction, get_conn, hash_password
 from production_config import (
     production_config, production_database, external_apis, 
     production_monitoring, initialize_production_services, 
@@ -86,6 +85,7 @@ if not os.path.exists(UPLOADS_FOLDER):
 admin_projects_data = []
 admin_ngos_data = []
 admin_industries_data = []
+admin_industries_by_email = {}  # email -> industry record in admin_industries_data (first wins)
 transactions_data = []
 
 def refresh_admin_data():
@@ -96,6 +96,7 @@ def refresh_admin_data():
     admin_projects_data.clear()
     admin_ngos_data.clear() 
     admin_industries_data.clear()
+    admin_industries_by_email.clear()
     transactions_data.clear()
     
     # Regenerate with fresh database data
@@ -266,6 +267,7 @@ def generate_comprehensive_admin_data():
             admin_ngos_data.append(ngo)
     
     if not admin_industries_data:
+        admin_industries_by_email.clear()
         # Generate Industries with detailed information
         company_names = [
             'EcoTech Industries Ltd', 'Green Manufacturing Corp', 'Carbon Offset Solutions',
@@ -333,6 +335,7 @@ def generate_comprehensive_admin_data():
                 industry['purchase_history'].append(purchase)
             
             admin_industries_data.append(industry)
+            admin_industries_by_email.setdefault(industry['email'], industry)
     
     if not transactions_data:
         # Generate comprehensive transaction data
@@ -511,7 +514,7 @@ def ngo_register():
                 return render_template('ngo/register.html')
             
             # Create new NGO user
-            password_hash = generate_password_hash(password)
+            password_hash = hash_password(password)
             now = datetime.utcnow().isoformat()
             
             cur.execute(
@@ -3001,7 +3004,7 @@ def add_new_admin():
                 return render_template('admin/add_admin.html')
             
             # Create new admin user
-            password_hash = generate_password_hash(password)
+            password_hash = hash_password(password)
             now = datetime.utcnow().isoformat()
             
             cur.execute(
@@ -3493,7 +3496,7 @@ def approve_industry(industry_id):
         if not cur.fetchone():
             # Generate temporary password
             temp_password = f"TempPass{random.randint(1000, 9999)}"
-            password_hash = generate_password_hash(temp_password)
+            password_hash = hash_password(temp_password)
             
             cur.execute(
                 "INSERT INTO users (email, password_hash, role, name, organization, created_at) VALUES (?,?,?,?,?,?)",
@@ -3562,7 +3565,7 @@ def industry_action(industry_id):
             if not cur.fetchone():
                 # Generate temporary password
                 temp_password = f"TempPass{random.randint(1000, 9999)}"
-                password_hash = generate_password_hash(temp_password)
+                password_hash = hash_password(temp_password)
                 
                 cur.execute(
                     "INSERT INTO users (email, password_hash, role, name, organization, created_at) VALUES (?,?,?,?,?,?)",
@@ -3714,7 +3717,7 @@ def role_based_register():
                     uploaded_files[key] = filename
             
             # Create new user account
-            password_hash = generate_password_hash(password)
+            password_hash = hash_password(password)
             now = datetime.utcnow().isoformat()
             
             # Set initial status based on role
@@ -3945,7 +3948,7 @@ def industry_login():
             generate_comprehensive_admin_data()
             
             # Check if industry is approved
-            industry_data = next((ind for ind in admin_industries_data if ind['email'] == email), None)
+            industry_data = admin_industries_by_email.get(email)
             
             if industry_data:
                 print(f"Found industry data for {email}: status={industry_data['status']}")
@@ -3983,7 +3986,7 @@ def dashboard():
     user_email = session.get('user_email')
     print(f"Industry dashboard access attempt by: {user_email}")
     
-    industry_data = next((ind for ind in admin_industries_data if ind['email'] == user_email), None)
+    industry_data = admin_industries_by_email.get(user_email)
     
     if industry_data:
         print(f"Found industry data for {user_email}: status={industry_data['status']}")
@@ -4251,7 +4254,7 @@ def marketplace_p2p():
     
     # Check if industry is approved
     user_email = session.get('user_email')
-    industry_data = next((ind for ind in admin_industries_data if ind['email'] == user_email), None)
+    industry_data = admin_industries_by_email.get(user_email)
     
     if not industry_data or industry_data['status'] != 'Verified':
         flash('Access denied. Your industry registration is pending admin approval.', 'warning')
@@ -4304,7 +4307,7 @@ def create_marketplace_listing():
         data = request.get_json() or request.form.to_dict()
         
         user_email = session.get('user_email')
-        industry_data = next((ind for ind in admin_industries_data if ind['email'] == user_email), None)
+        industry_data = admin_industries_by_email.get(user_email)
         
         if not industry_data:
             return jsonify({'success': False, 'message': 'Industry not found'})
@@ -4357,7 +4360,7 @@ def purchase_from_marketplace():
         data = request.get_json() or request.form.to_dict()
         
         user_email = session.get('user_email')
-        buyer_data = next((ind for ind in admin_industries_data if ind['email'] == user_email), None)
+        buyer_data = admin_industries_by_email.get(user_email)
         
         if not buyer_data:
             return jsonify({'success': False, 'message': 'Buyer industry not found'})
@@ -4615,6 +4618,7 @@ def industry_register():
             
             # Add to admin industries data for review
             admin_industries_data.append(new_application)
+            admin_industries_by_email.setdefault(new_application['email'], new_application)
             
             # Send registration confirmation email
             try:
@@ -15,14 +15,18 @@ Features:
 
 import asyncio
 import hashlib
+import heapq
 import json
+import random
+import sys
 import time
 from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional, Tuple, Any, Union
 import uuid
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from operator import attrgetter
 import hmac
 import base64
 
@@ -69,7 +73,7 @@ class ConsensusType(Enum):
     PRACTICAL_BYZANTINE_FAULT_TOLERANCE = "pbft"
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockchainTransaction:
     """Blockchain transaction data structure"""
     transaction_id: str
@@ -92,7 +96,7 @@ class BlockchainTransaction:
     error_message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditTrail:
     """Complete audit trail record"""
     trail_id: str
@@ -146,7 +150,7 @@ class MultiSignatureWallet:
     is_active: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class CarbonCredit:
     """Carbon credit token representation"""
     credit_id: str
@@ -226,6 +230,92 @@ class CryptoUtils:
             return False
 
 
+# Report templates holding only immutable defaults; builders copy and fill them
+_COMPLIANCE_REPORT_SKELETON: Dict[str, Any] = {
+    "entity_id": None,
+    "report_type": None,
+    "generated_at": None,
+    "total_audit_events": 0,
+    "total_transactions": 0,
+    "compliance_score": 0.0,
+    "risk_indicators": None,
+    "audit_timeline": None,
+    "verification_status": None,
+    "recommendations": None
+}
+
+_VERIFICATION_STATUS_SKELETON: Dict[str, Any] = {
+    "blockchain_verified": True,
+    "signature_verified": True,
+    "ipfs_backup_available": False,
+    "witness_signatures": 0
+}
+
+# (predicate over the finished report, recommendation) pairs, evaluated in order
+_COMPLIANCE_RECOMMENDATION_RULES = (
+    (lambda report: report["compliance_score"] < 80,
+     "Improve audit trail documentation"),
+    (lambda report: not report["verification_status"]["ipfs_backup_available"],
+     "Enable IPFS backup for critical data"),
+)
+
+
+def _canonical_audit_bytes(trail: AuditTrail) -> bytes:
+    """Canonical JSON bytes of an audit trail, as hashed by create_audit_trail"""
+    return json.dumps({
+        "trail_id": trail.trail_id,
+        "entity_id": trail.entity_id,
+        "entity_type": trail.entity_type,
+        "action_performed": trail.action_performed,
+        "actor_address": trail.actor_address,
+        "actor_role": trail.actor_role,
+        "timestamp": trail.timestamp.isoformat(),
+        "data_before": trail.data_before,
+        "data_after": trail.data_after
+    }, sort_keys=True).encode()
+
+
+def verify_audit_trails(trails: List[AuditTrail]) -> Tuple[List[str], int]:
+    """Recompute verification hashes for a batch of trails
+    
+    Returns the ids of trails whose stored hash no longer matches and the number
+    checked. Kept free of self and fully typed so it can be compiled with mypyc.
+    """
+    sha256 = hashlib.sha256
+    canonical = _canonical_audit_bytes
+    tampered_ids: List[str] = []
+    for trail in trails:
+        if sha256(canonical(trail)).hexdigest() != trail.verification_hash:
+            tampered_ids.append(trail.trail_id)
+    return tampered_ids, len(trails)
+
+
+class VerificationHashBloom:
+    """Bloom filter over hex SHA-256 digests of known-good audit trails"""
+    
+    def __init__(self, size_bits: int = 1 << 20, num_probes: int = 4):
+        self.size_bits = size_bits
+        self.num_probes = num_probes
+        self.bits = bytearray(size_bits // 8)
+    
+    def _positions(self, hex_hash: str) -> List[int]:
+        # The digest is already uniformly distributed, so slice it for probe positions
+        return [
+            int(hex_hash[i * 8:(i + 1) * 8], 16) % self.size_bits
+            for i in range(self.num_probes)
+        ]
+    
+    def add(self, hex_hash: str):
+        for position in self._positions(hex_hash):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, hex_hash: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(hex_hash)
+        )
+
+
 class IPFSInterface:
     """Simplified IPFS-like decentralized storage interface"""
     
@@ -254,6 +344,10 @@ class IPFSInterface:
         """Retrieve content by IPFS hash"""
         return self.storage.get(ipfs_hash)
     
+    async def has_content(self, ipfs_hash: str) -> bool:
+        """Check whether content is available without fetching it"""
+        return ipfs_hash in self.storage
+    
     async def pin_content(self, ipfs_hash: str) -> bool:
         """Pin content to prevent garbage collection"""
         if ipfs_hash in self.storage:
@@ -349,6 +443,32 @@ class BlockchainAuditSystem:
         self.multi_sig_wallets = {}
         self.carbon_credits = {}
         
+        # Compliance report cache:
+        # (entity_id, report_type, latest_trail_id, tx_count, tx_status_changes) -> (created, report)
+        self._latest_trail_id_by_entity = {}
+        self._tx_status_changes = 0  # bumped by every transaction status assignment
+        self.compliance_report_cache = OrderedDict()
+        self.compliance_report_ttl = 300  # seconds
+        self.compliance_report_cache_size = 1024
+        
+        # Rolling per-entity aggregates maintained as trails are created
+        self._entity_stats = defaultdict(lambda: {
+            "trail_count": 0,
+            "witness_sigs": 0
+        })
+        self._entity_has_ipfs = set()  # entities with at least one IPFS-backed trail
+        self._address_intern = {}
+        self._trails_by_entity = defaultdict(list)
+        
+        # Append-only columnar view of transactions for report scans; payload text
+        # is rendered once at creation instead of on every report
+        self._tx_columns: Dict[str, List[str]] = {
+            "transaction_id": [],
+            "payload_text": []
+        }
+        self._trail_bloom = VerificationHashBloom()
+        self._cached_iso_ts: Tuple[int, str] = (0, "")
+        
         # Initialize subsystems
         self.crypto_utils = CryptoUtils()
         self.ipfs = IPFSInterface()
@@ -358,12 +478,27 @@ class BlockchainAuditSystem:
         self.block_time = 15  # seconds
         self.confirmations_required = 6
         self.gas_price = 20  # gwei
+        self.ipfs_check_concurrency = 32  # max in-flight IPFS availability checks
         self.current_block_number = 1000000  # Starting block number
         
         # Private key for system operations (in production, use proper key management)
         self.system_private_key = "system_private_key_placeholder"
         self.system_public_key = "system_public_key_placeholder"
     
+    def _report_timestamp(self) -> str:
+        """Current time as an ISO string at second resolution, formatted at most once per second"""
+        second = int(time.time())
+        cached_second, cached_iso = self._cached_iso_ts
+        if second != cached_second:
+            cached_iso = datetime.fromtimestamp(second).isoformat()
+            self._cached_iso_ts = (second, cached_iso)
+        return cached_iso
+    
+    def _set_transaction_status(self, transaction: BlockchainTransaction, status: TransactionStatus):
+        """Move a transaction to a new status, invalidating cached compliance reports"""
+        transaction.status = status
+        self._tx_status_changes += 1
+    
     async def create_audit_trail(
         self,
         entity_id: str,
@@ -377,6 +512,12 @@ class BlockchainAuditSystem:
     ) -> AuditTrail:
         """Create immutable audit trail on blockchain"""
         
+        # Roles and entity types come from a small vocabulary and addresses repeat
+        # heavily, so share one string object per distinct value across trails
+        entity_type = sys.intern(entity_type)
+        actor_role = sys.intern(actor_role)
+        actor_address = self._address_intern.setdefault(actor_address, actor_address)
+        
         trail_id = str(uuid.uuid4())
         timestamp = datetime.now()
         
@@ -444,6 +585,15 @@ class BlockchainAuditSystem:
         
         # Store audit trail
         self.audit_trails[trail_id] = audit_trail
+        self._latest_trail_id_by_entity[entity_id] = trail_id
+        self._trails_by_entity[entity_id].append(audit_trail)
+        self._trail_bloom.add(verification_hash)
+        
+        entity_stats = self._entity_stats[entity_id]
+        entity_stats["trail_count"] += 1
+        entity_stats["witness_sigs"] += len(witness_signatures)
+        if ipfs_hash:
+            self._entity_has_ipfs.add(entity_id)
         
         return audit_trail
     
@@ -500,6 +650,8 @@ class BlockchainAuditSystem:
         
         # Store transaction
         self.transactions[transaction_id] = transaction
+        self._tx_columns["transaction_id"].append(transaction_id)
+        self._tx_columns["payload_text"].append(str(data_payload))
         self.pending_transactions.append(transaction_id)
         
         # Simulate blockchain broadcast
@@ -509,13 +661,13 @@ class BlockchainAuditSystem:
     
     async def broadcast_transaction(self, transaction: BlockchainTransaction):
         """Simulate broadcasting transaction to blockchain network"""
-        transaction.status = TransactionStatus.BROADCASTING
+        self._set_transaction_status(transaction, TransactionStatus.BROADCASTING)
         
         # Simulate network propagation delay
         await asyncio.sleep(1)
         
         # Simulate mining/validation process
-        transaction.status = TransactionStatus.CONFIRMING
+        self._set_transaction_status(transaction, TransactionStatus.CONFIRMING)
         transaction.block_number = self.current_block_number
         transaction.block_hash = f"0x{hashlib.sha256(str(self.current_block_number).encode()).hexdigest()}"
         
@@ -527,7 +679,7 @@ class BlockchainAuditSystem:
             await asyncio.sleep(2)  # Simulate block time
             transaction.confirmation_count = i + 1
         
-        transaction.status = TransactionStatus.CONFIRMED
+        self._set_transaction_status(transaction, TransactionStatus.CONFIRMED)
         
         # Remove from pending
         if transaction.transaction_id in self.pending_transactions:
@@ -551,9 +703,10 @@ class BlockchainAuditSystem:
                 matching_trails.append(trail)
         
         # Search in transactions
+        document_hash_type = TransactionType.DOCUMENT_HASH
         matching_transactions = []
         for tx in self.transactions.values():
-            if (tx.transaction_type == TransactionType.DOCUMENT_HASH and
+            if (tx.transaction_type is document_hash_type and
                 tx.data_payload.get("document_id") == document_id and
                 tx.data_hash == provided_hash):
                 matching_transactions.append(tx)
@@ -562,7 +715,7 @@ class BlockchainAuditSystem:
             "document_id": document_id,
             "provided_hash": provided_hash,
             "is_verified": len(matching_trails) > 0 or len(matching_transactions) > 0,
-            "verification_timestamp": datetime.now().isoformat(),
+            "verification_timestamp": self._report_timestamp(),
             "matching_audit_trails": len(matching_trails),
             "matching_transactions": len(matching_transactions),
             "blockchain_confirmations": 0,
@@ -768,16 +921,21 @@ class BlockchainAuditSystem:
         entity_type: Optional[str] = None,
         actor_address: Optional[str] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
     ) -> List[AuditTrail]:
-        """Retrieve audit history with filters"""
+        """Retrieve audit history with filters (most recent first, optionally capped at limit)"""
         
         filtered_trails = []
         
-        for trail in self.audit_trails.values():
+        # An entity filter can start from that entity's own trails
+        if entity_id:
+            candidates = self._trails_by_entity.get(entity_id, ())
+        else:
+            candidates = self.audit_trails.values()
+        
+        for trail in candidates:
             # Apply filters
-            if entity_id and trail.entity_id != entity_id:
-                continue
             if entity_type and trail.entity_type != entity_type:
                 continue
             if actor_address and trail.actor_address != actor_address:
@@ -789,13 +947,50 @@ class BlockchainAuditSystem:
             
             filtered_trails.append(trail)
         
+        # Only the newest `limit` entries are needed; avoid sorting the full history
+        if limit is not None:
+            return heapq.nlargest(limit, filtered_trails, key=attrgetter("timestamp"))
+        
         # Sort by timestamp (most recent first)
-        filtered_trails.sort(key=lambda x: x.timestamp, reverse=True)
+        filtered_trails.sort(key=attrgetter("timestamp"), reverse=True)
         
         return filtered_trails
     
-    async def verify_chain_integrity(self) -> Dict[str, Any]:
-        """Verify blockchain integrity and detect any tampering"""
+    async def check_ipfs_backups(self, trails: List[AuditTrail]) -> bool:
+        """Check whether any trail's IPFS backup is retrievable, with bounded concurrency
+        
+        Newest trails are checked first; the first positive answer cancels the checks still pending.
+        """
+        hashes = [trail.ipfs_hash for trail in reversed(trails) if trail.ipfs_hash]
+        if not hashes:
+            return False
+        semaphore = asyncio.Semaphore(self.ipfs_check_concurrency)
+        
+        async def _check(ipfs_hash: str) -> bool:
+            async with semaphore:
+                return await self.ipfs.has_content(ipfs_hash)
+        
+        tasks = [asyncio.ensure_future(_check(ipfs_hash)) for ipfs_hash in hashes]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                if await finished:
+                    return True
+            return False
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def verify_chain_integrity(
+        self,
+        sample_rate: float = 1.0,
+        block_size: int = 1024
+    ) -> Dict[str, Any]:
+        """Verify blockchain integrity and detect any tampering
+        
+        With sample_rate below 1.0 only that fraction of audit trails has its hash
+        recomputed; the rest are checked against the known-good hash filter, which
+        catches a rewritten verification_hash but not an edited payload.
+        """
         
         integrity_report = {
             "total_transactions": len(self.transactions),
@@ -804,7 +999,7 @@ class BlockchainAuditSystem:
             "failed_verifications": 0,
             "tampered_records": [],
             "overall_integrity": True,
-            "last_verification": datetime.now().isoformat()
+            "last_verification": self._report_timestamp()
         }
         
         # Verify transaction signatures
@@ -831,24 +1026,26 @@ class BlockchainAuditSystem:
                 integrity_report["tampered_records"].append(tx.transaction_id)
                 integrity_report["overall_integrity"] = False
         
-        # Verify audit trail signatures
-        for trail in self.audit_trails.values():
-            audit_data = {
-                "trail_id": trail.trail_id,
-                "entity_id": trail.entity_id,
-                "entity_type": trail.entity_type,
-                "action_performed": trail.action_performed,
-                "actor_address": trail.actor_address,
-                "actor_role": trail.actor_role,
-                "timestamp": trail.timestamp.isoformat(),
-                "data_before": trail.data_before,
-                "data_after": trail.data_after
-            }
+        # Verify audit trail signatures block by block; each block is hashed off the event loop
+        trails = list(self.audit_trails.values())
+        for start in range(0, len(trails), block_size):
+            block = trails[start:start + block_size]
             
-            verification_hash = self.crypto_utils.generate_hash(audit_data)
+            if sample_rate < 1.0:
+                to_recompute = []
+                for trail in block:
+                    if random.random() < sample_rate:
+                        to_recompute.append(trail)
+                    elif trail.verification_hash not in self._trail_bloom:
+                        integrity_report["tampered_records"].append(trail.trail_id)
+                        integrity_report["overall_integrity"] = False
+            else:
+                to_recompute = block
             
-            if verification_hash != trail.verification_hash:
-                integrity_report["tampered_records"].append(trail.trail_id)
+            tampered_ids, _ = await asyncio.to_thread(verify_audit_trails, to_recompute)
+            
+            if tampered_ids:
+                integrity_report["tampered_records"].extend(tampered_ids)
                 integrity_report["overall_integrity"] = False
         
         return integrity_report
@@ -860,71 +1057,119 @@ class BlockchainAuditSystem:
     ) -> Dict[str, Any]:
         """Generate comprehensive compliance report"""
         
-        # Get all audit trails for entity
-        entity_trails = await self.get_audit_history(entity_id=entity_id)
+        # The report only changes when the entity gains a new trail or the ledger
+        # gains a transaction or moves one to a new status, so all three are part of the cache key
+        cache_key = (
+            entity_id,
+            report_type,
+            self._latest_trail_id_by_entity.get(entity_id),
+            len(self.transactions),
+            self._tx_status_changes
+        )
+        cached = self.compliance_report_cache.get(cache_key)
+        if cached is not None:
+            cached_at, cached_report = cached
+            if time.monotonic() - cached_at < self.compliance_report_ttl:
+                self.compliance_report_cache.move_to_end(cache_key)
+                return self._copy_compliance_report(cached_report)
+            del self.compliance_report_cache[cache_key]
+        
+        compliance_report = await self._build_compliance_report(entity_id, report_type)
         
-        # Get related transactions
+        self.compliance_report_cache[cache_key] = (time.monotonic(), compliance_report)
+        if len(self.compliance_report_cache) > self.compliance_report_cache_size:
+            self.compliance_report_cache.popitem(last=False)
+        
+        return self._copy_compliance_report(compliance_report)
+    
+    def _copy_compliance_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Caller-owned copy of a cached report, stamped with the current time
+        
+        Only the containers are copied; every leaf value is an immutable string or number.
+        """
+        report_copy = report.copy()
+        report_copy["generated_at"] = self._report_timestamp()
+        report_copy["risk_indicators"] = list(report["risk_indicators"])
+        report_copy["audit_timeline"] = [event.copy() for event in report["audit_timeline"]]
+        report_copy["verification_status"] = report["verification_status"].copy()
+        report_copy["recommendations"] = list(report["recommendations"])
+        return report_copy
+    
+    async def _build_compliance_report(self, entity_id: str, report_type: str) -> Dict[str, Any]:
+        """Build a compliance report from the current ledger state"""
+        
+        # Trail counters come from the rolling aggregates; only the timeline touches trails
+        entity_stats = self._entity_stats.get(entity_id, {})
+        trail_count = entity_stats.get("trail_count", 0)
+        
+        # Get related transactions by scanning the payload text column
+        transactions = self.transactions
         entity_transactions = [
-            tx for tx in self.transactions.values()
-            if entity_id in str(tx.data_payload)
+            transactions[transaction_id]
+            for transaction_id, payload_text in zip(
+                self._tx_columns["transaction_id"],
+                self._tx_columns["payload_text"]
+            )
+            if entity_id in payload_text
         ]
         
-        # Calculate compliance metrics
-        compliance_report = {
-            "entity_id": entity_id,
-            "report_type": report_type,
-            "generated_at": datetime.now().isoformat(),
-            "total_audit_events": len(entity_trails),
-            "total_transactions": len(entity_transactions),
-            "compliance_score": 0.0,
-            "risk_indicators": [],
-            "audit_timeline": [],
-            "verification_status": {},
-            "recommendations": []
-        }
+        # Calculate compliance metrics; the skeleton fixes key order and constant defaults
+        compliance_report = _COMPLIANCE_REPORT_SKELETON.copy()
+        compliance_report["entity_id"] = entity_id
+        compliance_report["report_type"] = report_type
+        compliance_report["generated_at"] = self._report_timestamp()
+        compliance_report["total_audit_events"] = trail_count
+        compliance_report["total_transactions"] = len(entity_transactions)
+        compliance_report["risk_indicators"] = []
         
         # Calculate compliance score
         base_score = 100.0
         
         # Deduct points for issues
-        if len(entity_trails) == 0:
+        if trail_count == 0:
             base_score -= 50  # No audit trail
             compliance_report["risk_indicators"].append("NO_AUDIT_TRAIL")
         
-        # Check for transaction failures
-        failed_transactions = [tx for tx in entity_transactions if tx.status == TransactionStatus.FAILED]
-        if failed_transactions:
-            base_score -= len(failed_transactions) * 5
+        # Check for transaction failures (enum members are singletons, so compare by identity)
+        failed = TransactionStatus.FAILED
+        failed_count = sum(1 for tx in entity_transactions if tx.status is failed)
+        if failed_count:
+            base_score -= failed_count * 5
             compliance_report["risk_indicators"].append("FAILED_TRANSACTIONS")
         
         # Check for irregular patterns
-        if len(entity_trails) > 100:  # High activity
+        if trail_count > 100:  # High activity
             compliance_report["risk_indicators"].append("HIGH_ACTIVITY")
         
         compliance_report["compliance_score"] = max(0.0, base_score)
         
-        # Create audit timeline
-        for trail in entity_trails[:10]:  # Latest 10 events
-            compliance_report["audit_timeline"].append({
+        # Create audit timeline (latest 10 events)
+        latest_trails = await self.get_audit_history(entity_id=entity_id, limit=10)
+        compliance_report["audit_timeline"] = [
+            {
                 "timestamp": trail.timestamp.isoformat(),
                 "action": trail.action_performed,
                 "actor": trail.actor_address,
-                "verification_hash": trail.verification_hash[:16] + "..."
-            })
+                "verification_hash": f"{trail.verification_hash[:16]}..."
+            }
+            for trail in latest_trails
+        ]
         
         # Verification status
-        compliance_report["verification_status"] = {
-            "blockchain_verified": True,
-            "signature_verified": True,
-            "ipfs_backup_available": any(trail.ipfs_hash for trail in entity_trails),
-            "witness_signatures": sum(len(trail.witness_signatures) for trail in entity_trails)
-        }
+        verification_status = _VERIFICATION_STATUS_SKELETON.copy()
+        # Only entities that ever stored a backup need the IPFS round trips
+        verification_status["ipfs_backup_available"] = (
+            entity_id in self._entity_has_ipfs
+            and await self.check_ipfs_backups(self._trails_by_entity[entity_id])
+        )
+        verification_status["witness_signatures"] = entity_stats.get("witness_sigs", 0)
+        compliance_report["verification_status"] = verification_status
         
         # Generate recommendations
-        if compliance_report["compliance_score"] < 80:
-            compliance_report["recommendations"].append("Improve audit trail documentation")
-        if not compliance_report["verification_status"]["ipfs_backup_available"]:
-            compliance_report["recommendations"].append("Enable IPFS backup for critical data")
+        compliance_report["recommendations"] = [
+            message for rule, message in _COMPLIANCE_RECOMMENDATION_RULES
+            if rule(compliance_report)
+        ]
         
         return compliance_report
 
@@ -933,20 +1178,32 @@ class BlockchainAuditSystem:
 async def demo_blockchain_audit_system():
     """Demonstrate the blockchain audit system capabilities"""
     
-    print("=== BlueCarbon MRV Blockchain Audit System Demo ===")
-    print("🔗 Immutable Audit Trails, Smart Contracts & Carbon Credits")
-    print()
+    # Output is buffered per section and written from a worker thread so a slow
+    # terminal never blocks the event loop between awaits
+    lines: List[str] = []
+    
+    async def flush_output():
+        if lines:
+            text = "\n".join(lines) + "\n"
+            lines.clear()
+            await asyncio.to_thread(sys.stdout.write, text)
+    
+    lines.append("=== BlueCarbon MRV Blockchain Audit System Demo ===")
+    lines.append("🔗 Immutable Audit Trails, Smart Contracts & Carbon Credits")
+    lines.append("")
     
     # Initialize blockchain system
     audit_system = BlockchainAuditSystem(BlockchainNetwork.PRIVATE_NETWORK)
     
     # Demo 1: Document Hash Verification
-    print("📄 Demo 1: Document Hash Verification")
-    print("-" * 50)
+    lines.append("📄 Demo 1: Document Hash Verification")
+    lines.append("-" * 50)
     
     document_id = "ENV_PERMIT_2024_001"
     document_hash = "a1b2c3d4e5f6789..."
     
+    await flush_output()
+    
     # Create audit trail for document
     audit_trail = await audit_system.create_audit_trail(
         entity_id=document_id,
@@ -961,20 +1218,24 @@ async def demo_blockchain_audit_system():
         }
     )
     
-    print(f"✅ Audit Trail Created: {audit_trail.trail_id}")
-    print(f"   Transaction Hash: {audit_trail.transaction_hash}")
-    print(f"   IPFS Hash: {audit_trail.ipfs_hash}")
-    print(f"   Verification Hash: {audit_trail.verification_hash[:16]}...")
+    lines.append(f"✅ Audit Trail Created: {audit_trail.trail_id}")
+    lines.append(f"   Transaction Hash: {audit_trail.transaction_hash}")
+    lines.append(f"   IPFS Hash: {audit_trail.ipfs_hash}")
+    lines.append(f"   Verification Hash: {audit_trail.verification_hash[:16]}...")
+    
+    await flush_output()
     
     # Verify document hash
     verification_result = await audit_system.verify_document_hash(document_id, document_hash)
-    print(f"🔍 Document Verification: {'✅ VERIFIED' if verification_result['is_verified'] else '❌ FAILED'}")
-    print(f"   Trust Score: {verification_result['trust_score']:.1%}")
-    print()
+    lines.append(f"🔍 Document Verification: {'✅ VERIFIED' if verification_result['is_verified'] else '❌ FAILED'}")
+    lines.append(f"   Trust Score: {verification_result['trust_score']:.1%}")
+    lines.append("")
     
     # Demo 2: Carbon Credit Issuance
-    print("🌱 Demo 2: Carbon Credit Issuance")
-    print("-" * 50)
+    lines.append("🌱 Demo 2: Carbon Credit Issuance")
+    lines.append("-" * 50)
+    
+    await flush_output()
     
     carbon_credit = await audit_system.issue_carbon_credit(
         project_id="BCM_2024_MANGROVE_001",
@@ -985,16 +1246,18 @@ async def demo_blockchain_audit_system():
         owner_address="0xabcdef1234567890"
     )
     
-    print(f"💳 Carbon Credit Issued: {carbon_credit.credit_id}")
-    print(f"   Quantity: {carbon_credit.quantity} {carbon_credit.unit}")
-    print(f"   Owner: {carbon_credit.current_owner}")
-    print(f"   Verification Standard: {carbon_credit.verification_standard}")
-    print(f"   Transaction History: {len(carbon_credit.transaction_history)} entries")
-    print()
+    lines.append(f"💳 Carbon Credit Issued: {carbon_credit.credit_id}")
+    lines.append(f"   Quantity: {carbon_credit.quantity} {carbon_credit.unit}")
+    lines.append(f"   Owner: {carbon_credit.current_owner}")
+    lines.append(f"   Verification Standard: {carbon_credit.verification_standard}")
+    lines.append(f"   Transaction History: {len(carbon_credit.transaction_history)} entries")
+    lines.append("")
     
     # Demo 3: Carbon Credit Transfer
-    print("🔄 Demo 3: Carbon Credit Transfer")
-    print("-" * 50)
+    lines.append("🔄 Demo 3: Carbon Credit Transfer")
+    lines.append("-" * 50)
+    
+    await flush_output()
     
     transfer_result = await audit_system.transfer_carbon_credit(
         credit_id=carbon_credit.credit_id,
@@ -1004,16 +1267,18 @@ async def demo_blockchain_audit_system():
         transaction_price=27.50
     )
     
-    print(f"💸 Transfer Completed: {'✅ SUCCESS' if transfer_result['success'] else '❌ FAILED'}")
-    print(f"   Transaction Hash: {transfer_result['transaction_hash']}")
-    print(f"   Amount Transferred: {transfer_result['transfer_amount']} tonnes CO2e")
-    print(f"   Remaining Quantity: {transfer_result['remaining_quantity']} tonnes CO2e")
-    print(f"   New Owner: {transfer_result['new_owner']}")
-    print()
+    lines.append(f"💸 Transfer Completed: {'✅ SUCCESS' if transfer_result['success'] else '❌ FAILED'}")
+    lines.append(f"   Transaction Hash: {transfer_result['transaction_hash']}")
+    lines.append(f"   Amount Transferred: {transfer_result['transfer_amount']} tonnes CO2e")
+    lines.append(f"   Remaining Quantity: {transfer_result['remaining_quantity']} tonnes CO2e")
+    lines.append(f"   New Owner: {transfer_result['new_owner']}")
+    lines.append("")
     
     # Demo 4: Multi-Signature Wallet
-    print("🔐 Demo 4: Multi-Signature Wallet Creation")
-    print("-" * 50)
+    lines.append("🔐 Demo 4: Multi-Signature Wallet Creation")
+    lines.append("-" * 50)
+    
+    await flush_output()
     
     multisig_wallet = await audit_system.create_multi_signature_wallet(
         signers=[
@@ -1025,15 +1290,15 @@ async def demo_blockchain_audit_system():
         daily_limits={"carbon_credits": 5000.0, "fiat": 100000.0}
     )
     
-    print(f"🏦 Multi-Sig Wallet Created: {multisig_wallet.wallet_id}")
-    print(f"   Wallet Address: {multisig_wallet.wallet_address}")
-    print(f"   Required Signatures: {multisig_wallet.required_signatures}/{multisig_wallet.total_signers}")
-    print(f"   Daily Limits: {multisig_wallet.daily_limits}")
-    print()
+    lines.append(f"🏦 Multi-Sig Wallet Created: {multisig_wallet.wallet_id}")
+    lines.append(f"   Wallet Address: {multisig_wallet.wallet_address}")
+    lines.append(f"   Required Signatures: {multisig_wallet.required_signatures}/{multisig_wallet.total_signers}")
+    lines.append(f"   Daily Limits: {multisig_wallet.daily_limits}")
+    lines.append("")
     
     # Demo 5: Smart Contract Deployment
-    print("📜 Demo 5: Smart Contract Deployment")
-    print("-" * 50)
+    lines.append("📜 Demo 5: Smart Contract Deployment")
+    lines.append("-" * 50)
     
     contract_code = """
     pragma solidity ^0.8.0;
@@ -1053,6 +1318,8 @@ async def demo_blockchain_audit_system():
     }
     """
     
+    await flush_output()
+    
     smart_contract = await audit_system.smart_contracts.deploy_contract(
         contract_code=contract_code,
         constructor_args=[],
@@ -1060,78 +1327,83 @@ async def demo_blockchain_audit_system():
         network=BlockchainNetwork.PRIVATE_NETWORK
     )
     
-    print(f"📝 Smart Contract Deployed: {smart_contract.contract_name}")
-    print(f"   Contract Address: {smart_contract.contract_address}")
-    print(f"   Deployment Hash: {smart_contract.deployment_hash}")
-    print(f"   Gas Used: {smart_contract.gas_used:,}")
-    print(f"   Is Verified: {'✅' if smart_contract.is_verified else '❌'}")
-    print()
+    lines.append(f"📝 Smart Contract Deployed: {smart_contract.contract_name}")
+    lines.append(f"   Contract Address: {smart_contract.contract_address}")
+    lines.append(f"   Deployment Hash: {smart_contract.deployment_hash}")
+    lines.append(f"   Gas Used: {smart_contract.gas_used:,}")
+    lines.append(f"   Is Verified: {'✅' if smart_contract.is_verified else '❌'}")
+    lines.append("")
     
-    # Demo 6: Audit History Retrieval
-    print("📊 Demo 6: Audit History Analysis")
-    print("-" * 50)
+    await flush_output()
     
-    audit_history = await audit_system.get_audit_history(
-        entity_type="carbon_credit",
-        start_date=datetime.now() - timedelta(hours=1)
+    # Demos 6-8 are independent read-only queries, so run them concurrently
+    audit_history, integrity_report, compliance_report = await asyncio.gather(
+        audit_system.get_audit_history(
+            entity_type="carbon_credit",
+            start_date=datetime.now() - timedelta(hours=1)
+        ),
+        audit_system.verify_chain_integrity(),
+        audit_system.generate_compliance_report(
+            entity_id=carbon_credit.credit_id,
+            report_type="carbon_credit_audit"
+        )
     )
     
-    print(f"📈 Audit History Retrieved: {len(audit_history)} entries")
+    # Demo 6: Audit History Retrieval
+    lines.append("📊 Demo 6: Audit History Analysis")
+    lines.append("-" * 50)
+    
+    lines.append(f"📈 Audit History Retrieved: {len(audit_history)} entries")
     for i, trail in enumerate(audit_history[:3]):  # Show first 3
-        print(f"   {i+1}. {trail.action_performed} by {trail.actor_role}")
-        print(f"      Timestamp: {trail.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"      Entity: {trail.entity_type}:{trail.entity_id}")
-    print()
+        lines.append(f"   {i+1}. {trail.action_performed} by {trail.actor_role}")
+        lines.append(f"      Timestamp: {trail.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"      Entity: {trail.entity_type}:{trail.entity_id}")
+    lines.append("")
     
     # Demo 7: Chain Integrity Verification
-    print("🔒 Demo 7: Blockchain Integrity Verification")
-    print("-" * 50)
-    
-    integrity_report = await audit_system.verify_chain_integrity()
+    lines.append("🔒 Demo 7: Blockchain Integrity Verification")
+    lines.append("-" * 50)
     
-    print(f"🛡️  Integrity Check: {'✅ PASSED' if integrity_report['overall_integrity'] else '❌ FAILED'}")
-    print(f"   Total Transactions: {integrity_report['total_transactions']}")
-    print(f"   Verified Signatures: {integrity_report['verified_signatures']}")
-    print(f"   Failed Verifications: {integrity_report['failed_verifications']}")
-    print(f"   Tampered Records: {len(integrity_report['tampered_records'])}")
-    print()
+    lines.append(f"🛡️  Integrity Check: {'✅ PASSED' if integrity_report['overall_integrity'] else '❌ FAILED'}")
+    lines.append(f"   Total Transactions: {integrity_report['total_transactions']}")
+    lines.append(f"   Verified Signatures: {integrity_report['verified_signatures']}")
+    lines.append(f"   Failed Verifications: {integrity_report['failed_verifications']}")
+    lines.append(f"   Tampered Records: {len(integrity_report['tampered_records'])}")
+    lines.append("")
     
     # Demo 8: Compliance Report Generation
-    print("📋 Demo 8: Compliance Report Generation")
-    print("-" * 50)
+    lines.append("📋 Demo 8: Compliance Report Generation")
+    lines.append("-" * 50)
     
-    compliance_report = await audit_system.generate_compliance_report(
-        entity_id=carbon_credit.credit_id,
-        report_type="carbon_credit_audit"
-    )
-    
-    print(f"📊 Compliance Report Generated")
-    print(f"   Entity ID: {compliance_report['entity_id']}")
-    print(f"   Compliance Score: {compliance_report['compliance_score']:.1f}/100")
-    print(f"   Total Audit Events: {compliance_report['total_audit_events']}")
-    print(f"   Risk Indicators: {len(compliance_report['risk_indicators'])}")
-    print(f"   Blockchain Verified: {'✅' if compliance_report['verification_status']['blockchain_verified'] else '❌'}")
+    lines.append(f"📊 Compliance Report Generated")
+    lines.append(f"   Entity ID: {compliance_report['entity_id']}")
+    lines.append(f"   Compliance Score: {compliance_report['compliance_score']:.1f}/100")
+    lines.append(f"   Total Audit Events: {compliance_report['total_audit_events']}")
+    lines.append(f"   Risk Indicators: {len(compliance_report['risk_indicators'])}")
+    lines.append(f"   Blockchain Verified: {'✅' if compliance_report['verification_status']['blockchain_verified'] else '❌'}")
     
     if compliance_report["recommendations"]:
-        print(f"   Recommendations:")
+        lines.append(f"   Recommendations:")
         for rec in compliance_report["recommendations"]:
-            print(f"     - {rec}")
-    
-    print("\n" + "=" * 60)
-    print("📈 SYSTEM STATISTICS")
-    print("=" * 60)
-    print(f"Total Transactions: {len(audit_system.transactions)}")
-    print(f"Total Audit Trails: {len(audit_system.audit_trails)}")
-    print(f"Total Carbon Credits: {len(audit_system.carbon_credits)}")
-    print(f"Multi-Sig Wallets: {len(audit_system.multi_sig_wallets)}")
-    print(f"Smart Contracts: {len(audit_system.smart_contracts.deployed_contracts)}")
-    print(f"IPFS Storage: {len(audit_system.ipfs.storage)} files")
-    print(f"Pending Transactions: {len(audit_system.pending_transactions)}")
-    
-    print("\n✅ Blockchain Audit System Demo Complete!")
-    print("🔗 All operations recorded on immutable blockchain ledger")
-    print("🛡️  Data integrity maintained with cryptographic proofs")
-    print("🌍 Ready for carbon credit trading and MRV compliance")
+            lines.append(f"     - {rec}")
+    
+    lines.append("\n" + "=" * 60)
+    lines.append("📈 SYSTEM STATISTICS")
+    lines.append("=" * 60)
+    lines.append(f"Total Transactions: {len(audit_system.transactions)}")
+    lines.append(f"Total Audit Trails: {len(audit_system.audit_trails)}")
+    lines.append(f"Total Carbon Credits: {len(audit_system.carbon_credits)}")
+    lines.append(f"Multi-Sig Wallets: {len(audit_system.multi_sig_wallets)}")
+    lines.append(f"Smart Contracts: {len(audit_system.smart_contracts.deployed_contracts)}")
+    lines.append(f"IPFS Storage: {len(audit_system.ipfs.storage)} files")
+    lines.append(f"Pending Transactions: {len(audit_system.pending_transactions)}")
+    
+    lines.append("\n✅ Blockchain Audit System Demo Complete!")
+    lines.append("🔗 All operations recorded on immutable blockchain ledger")
+    lines.append("🛡️  Data integrity maintained with cryptographic proofs")
+    lines.append("🌍 Ready for carbon credit trading and MRV compliance")
+    
+    await flush_output()
 
 
 if __name__ == "__main__":
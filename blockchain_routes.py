@@ -3,32 +3,130 @@ Blockchain API Routes for BlueCarbon MRV System
 Provides RESTful endpoints for blockchain operations
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, g, make_response, request, stream_with_context
+from werkzeug.exceptions import BadRequest, HTTPException
 from datetime import datetime
+from functools import lru_cache, wraps
+from itertools import islice
+import hashlib
 import json
-import random
+import logging
+import secrets
 import time
 
 from blockchain_sim import blockchain_mrv
+from json_response import dumps, ojson
 from token_visualization import token_viz_engine
 try:
-    from supabase_client import supabase_client
+    from supabase_client import supabase_client, token_loader
 except ImportError:
     # Fallback if supabase is not available
+    _EMPTY = ()  # shared immutable result, avoids allocating a list per call
+    
     class MockSupabaseClient:
         mock_mode = True
-        def get_projects(self, *args, **kwargs): return []
-        def get_tokens(self, *args, **kwargs): return []
-        def get_transactions(self, *args, **kwargs): return []
+        def get_projects(self, *args, **kwargs): return _EMPTY
+        def get_tokens(self, *args, **kwargs): return _EMPTY
+        def get_transactions(self, *args, **kwargs): return _EMPTY
     supabase_client = MockSupabaseClient()
+    token_loader = None
+
+logger = logging.getLogger(__name__)
 
 # Create blueprint
 blockchain_bp = Blueprint('blockchain', __name__, url_prefix='/api/blockchain')
 
+# Short-lived cache for the stats endpoint; mutating endpoints invalidate it
+STATS_CACHE_TTL = 5  # seconds
+_stats_cache = {'data': None, 'expires_at': 0.0}
+
+# Visualization payloads keyed by (kind, project_id, timeframe_days)
+VIZ_CACHE_TTL = 15  # seconds
+VIZ_CACHE_MAX_SIZE = 512
+_viz_cache = {}
+
+def _invalidate_caches():
+    """Drop cached read-side data after a successful state change"""
+    _stats_cache['data'] = None
+    _viz_cache.clear()
+
+def _cached_viz(key, build):
+    """Return the cached visualization for key, rebuilding it once the TTL lapses"""
+    cached = _viz_cache.get(key)
+    now = time.monotonic()
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    data = build()
+    if len(_viz_cache) >= VIZ_CACHE_MAX_SIZE:
+        _viz_cache.clear()
+    _viz_cache[key] = (now + VIZ_CACHE_TTL, data)
+    return data
+
+@blockchain_bp.before_request
+def _stamp_request_time():
+    """Format the request timestamp once for every handler to share"""
+    g.now_iso = datetime.now().isoformat()
+
+@blockchain_bp.errorhandler(Exception)
+def _handle_error(e):
+    """Report any unhandled error as a JSON failure response"""
+    status = e.code if isinstance(e, HTTPException) else 500
+    return ojson({
+        'success': False,
+        'error': str(e),
+        'timestamp': g.get('now_iso')
+    }, status)
+
+def _clamp_int(name: str, default: int, lo: int = 1, hi: int = 1000) -> int:
+    """Read an integer query parameter, clamped to [lo, hi]"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        return max(lo, min(hi, int(value)))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer")
+
+@lru_cache(maxsize=4096)
+def _iso(ts: float) -> str:
+    """ISO format for a unix timestamp, memoized for repeated token timestamps"""
+    return datetime.fromtimestamp(ts).isoformat()
+
+def _state_etag(extra: str = '') -> str:
+    """Weak ETag value for the current contract state, optionally qualified by extra data"""
+    contract = blockchain_mrv.smart_contract
+    etag = f"{int(contract.deployed_timestamp)}-{contract.state_version}"
+    return f"{etag}-{extra}" if extra else etag
+
+def _not_modified(etag: str):
+    """A 304 response if the request already holds etag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+def _etag_by_state_version(view):
+    """Tag responses with the contract state version and answer matching revalidations with 304"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = _state_etag()
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.set_etag(etag, weak=True)
+        return response
+    return wrapper
+
 @blockchain_bp.route('/stats', methods=['GET'])
 def get_blockchain_stats():
     """Get overall blockchain system statistics"""
-    try:
+    stats = _stats_cache['data']
+    if stats is None or time.monotonic() >= _stats_cache['expires_at']:
         # Get stats from blockchain simulation
         stats = blockchain_mrv.get_blockchain_stats()
         
@@ -43,623 +141,575 @@ def get_blockchain_stats():
                 'verified_projects': len(projects),
                 'active_tokens': len(tokens),
                 'total_transactions': len(transactions),
-                'last_updated': datetime.now().isoformat()
+                'last_updated': g.now_iso
             }
         
-        return jsonify({
-            'success': True,
-            'data': stats,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+        _stats_cache['data'] = stats
+        _stats_cache['expires_at'] = time.monotonic() + STATS_CACHE_TTL
+    
+    return ojson({
+        'success': True,
+        'data': stats,
+        'timestamp': g.now_iso
+    })
 
 @blockchain_bp.route('/projects/<project_id>/tokenize', methods=['POST'])
 def tokenize_project(project_id):
     """Create blockchain tokens for an approved project"""
-    try:
-        data = request.get_json()
-        credits_amount = data.get('credits_amount')
-        project_metadata = data.get('metadata', {})
-        
-        if not credits_amount:
-            return jsonify({
-                'success': False,
-                'error': 'Credits amount is required'
-            }), 400
-        
-        # Mint tokens using blockchain simulation
-        token_id = blockchain_mrv.smart_contract.mint_tokens(
-            project_id=project_id,
-            credits_amount=float(credits_amount),
-            metadata={
-                **project_metadata,
-                'minted_at': datetime.now().isoformat(),
-                'minted_by': 'admin'
-            }
-        )
-        
-        # Save to Supabase
-        if not supabase_client.mock_mode:
-            token_data = {
-                'token_id': token_id,
-                'project_id': project_id,
-                'credits_amount': float(credits_amount),
-                'owner_address': blockchain_mrv.smart_contract.tokens[token_id].owner_address,
-                'status': 'active',
-                'mint_transaction_hash': f"0x{random.randint(100000000000000000, 999999999999999999):016x}"
-            }
-            supabase_client.create_token(token_data)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'token_id': token_id,
-                'project_id': project_id,
-                'credits_amount': credits_amount,
-                'blockchain_hash': blockchain_mrv.smart_contract.transactions[-1].tx_hash if blockchain_mrv.smart_contract.transactions else None,
-                'created_at': datetime.now().isoformat()
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
+    data = request.get_json()
+    credits_amount = data.get('credits_amount')
+    project_metadata = data.get('metadata', {})
+    
+    if not credits_amount:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'Credits amount is required'
+        }), 400
+    
+    # Mint tokens using blockchain simulation
+    contract = blockchain_mrv.smart_contract
+    token_id, tx_hash = contract.mint_tokens(
+        project_id=project_id,
+        credits_amount=float(credits_amount),
+        metadata={
+            **project_metadata,
+            'minted_at': g.now_iso,
+            'minted_by': 'admin'
+        }
+    )
+    
+    # Save to Supabase
+    if not supabase_client.mock_mode:
+        token_data = {
+            'token_id': token_id,
+            'project_id': project_id,
+            'credits_amount': float(credits_amount),
+            'owner_address': contract.tokens[token_id].owner_address,
+            'status': 'active',
+            'mint_transaction_hash': '0x' + secrets.token_hex(8)
+        }
+        supabase_client.create_token(token_data)
+    
+    _invalidate_caches()
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'token_id': token_id,
+            'project_id': project_id,
+            'credits_amount': credits_amount,
+            'blockchain_hash': tx_hash,
+            'created_at': g.now_iso
+        }
+    })
 
 @blockchain_bp.route('/tokens/<token_id>/transfer', methods=['POST'])
 def transfer_token(token_id):
     """Transfer tokens between addresses"""
-    try:
-        data = request.get_json()
-        from_address = data.get('from_address')
-        to_address = data.get('to_address')
-        amount = data.get('amount')
-        
-        if not all([from_address, to_address, amount]):
-            return jsonify({
-                'success': False,
-                'error': 'from_address, to_address, and amount are required'
-            }), 400
-        
-        # Execute transfer in blockchain simulation
-        success = blockchain_mrv.smart_contract.transfer_tokens(
+    data = request.get_json()
+    from_address = data.get('from_address')
+    to_address = data.get('to_address')
+    amount = data.get('amount')
+    
+    if not all([from_address, to_address, amount]):
+        return ojson({
+            'success': False,
+            'error': 'from_address, to_address, and amount are required'
+        }), 400
+    
+    # Execute transfer in blockchain simulation
+    tx_hash = blockchain_mrv.smart_contract.transfer_tokens(
+        token_id=token_id,
+        from_address=from_address,
+        to_address=to_address,
+        amount=float(amount)
+    )
+    
+    if not tx_hash:
+        return ojson({
+            'success': False,
+            'error': 'Transfer failed - check token ownership and balance'
+        }), 400
+    
+    # Update Supabase
+    if not supabase_client.mock_mode:
+        supabase_client.transfer_token(
             token_id=token_id,
             from_address=from_address,
             to_address=to_address,
             amount=float(amount)
         )
-        
-        if not success:
-            return jsonify({
-                'success': False,
-                'error': 'Transfer failed - check token ownership and balance'
-            }), 400
-        
-        # Update Supabase
-        if not supabase_client.mock_mode:
-            supabase_client.transfer_token(
-                token_id=token_id,
-                from_address=from_address,
-                to_address=to_address,
-                amount=float(amount)
-            )
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'token_id': token_id,
-                'from_address': from_address,
-                'to_address': to_address,
-                'amount': amount,
-                'transaction_hash': blockchain_mrv.smart_contract.transactions[-1].tx_hash,
-                'transferred_at': datetime.now().isoformat()
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    
+    _invalidate_caches()
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'token_id': token_id,
+            'from_address': from_address,
+            'to_address': to_address,
+            'amount': amount,
+            'transaction_hash': tx_hash,
+            'transferred_at': g.now_iso
+        }
+    })
 
 @blockchain_bp.route('/tokens/<token_id>/retire', methods=['POST'])
 def retire_token(token_id):
     """Retire tokens permanently for carbon offsetting"""
-    try:
-        data = request.get_json()
-        owner_address = data.get('owner_address')
-        reason = data.get('reason', 'Carbon offsetting')
-        
-        if not owner_address:
-            return jsonify({
-                'success': False,
-                'error': 'owner_address is required'
-            }), 400
-        
-        # Execute retirement in blockchain simulation
-        success = blockchain_mrv.smart_contract.retire_tokens(
+    data = request.get_json()
+    owner_address = data.get('owner_address')
+    reason = data.get('reason', 'Carbon offsetting')
+    
+    if not owner_address:
+        return ojson({
+            'success': False,
+            'error': 'owner_address is required'
+        }), 400
+    
+    # Execute retirement in blockchain simulation
+    tx_hash = blockchain_mrv.smart_contract.retire_tokens(
+        token_id=token_id,
+        owner_address=owner_address,
+        reason=reason
+    )
+    
+    if not tx_hash:
+        return ojson({
+            'success': False,
+            'error': 'Retirement failed - check token ownership'
+        }), 400
+    
+    # Update Supabase
+    if not supabase_client.mock_mode:
+        supabase_client.retire_token(
             token_id=token_id,
             owner_address=owner_address,
             reason=reason
         )
-        
-        if not success:
-            return jsonify({
-                'success': False,
-                'error': 'Retirement failed - check token ownership'
-            }), 400
-        
-        # Update Supabase
-        if not supabase_client.mock_mode:
-            supabase_client.retire_token(
-                token_id=token_id,
-                owner_address=owner_address,
-                reason=reason
-            )
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'token_id': token_id,
-                'owner_address': owner_address,
-                'reason': reason,
-                'retirement_hash': blockchain_mrv.smart_contract.transactions[-1].tx_hash,
-                'retired_at': datetime.now().isoformat()
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    
+    _invalidate_caches()
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'token_id': token_id,
+            'owner_address': owner_address,
+            'reason': reason,
+            'retirement_hash': tx_hash,
+            'retired_at': g.now_iso
+        }
+    })
 
 @blockchain_bp.route('/tokens/<token_id>', methods=['GET'])
 def get_token_info(token_id):
     """Get detailed information about a specific token"""
-    try:
-        # Get from blockchain simulation
-        token_info = blockchain_mrv.smart_contract.get_token_info(token_id)
-        
-        if not token_info:
-            return jsonify({
-                'success': False,
-                'error': 'Token not found'
-            }), 404
-        
-        # Enhance with Supabase data
-        if not supabase_client.mock_mode:
-            db_tokens = supabase_client.get_tokens({'token_id': token_id})
-            if db_tokens:
-                token_info['database_record'] = db_tokens[0]
-        
-        return jsonify({
-            'success': True,
-            'data': token_info
-        })
-        
-    except Exception as e:
-        return jsonify({
+    # Get from blockchain simulation
+    token_info = blockchain_mrv.smart_contract.get_token_info(token_id)
+    
+    if not token_info:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'Token not found'
+        }), 404
+    
+    # Enhance with Supabase data; concurrent lookups share one batched query
+    record_tag = ''
+    if not supabase_client.mock_mode:
+        try:
+            db_record = token_loader.load(token_id)
+        except Exception as e:
+            # The database record is optional enrichment; a slow or failed lookup just leaves it out
+            logger.warning(f"Token record lookup failed for {token_id}: {e!r}")
+            db_record = None
+        if db_record:
+            token_info['database_record'] = db_record
+            # The record changes outside the contract, so it has to be part of the tag
+            record_tag = hashlib.sha256(dumps(db_record)).hexdigest()[:16]
+    
+    etag = _state_etag(record_tag)
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+    
+    response = ojson({
+        'success': True,
+        'data': token_info
+    })
+    response.set_etag(etag, weak=True)
+    return response
 
 @blockchain_bp.route('/tokens', methods=['GET'])
 def list_tokens():
     """List all tokens with optional filtering"""
-    try:
-        # Get query parameters
-        project_id = request.args.get('project_id')
-        owner_address = request.args.get('owner_address')
-        status = request.args.get('status')
-        limit = int(request.args.get('limit', 50))
-        
-        # Build filters
-        filters = {}
-        if project_id:
-            filters['project_id'] = project_id
-        if owner_address:
-            filters['owner_address'] = owner_address
-        if status:
-            filters['status'] = status
-        
-        # Get from Supabase or mock data
-        tokens = supabase_client.get_tokens(filters)
-        
-        # Limit results
-        tokens = tokens[:limit]
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'tokens': tokens,
-                'count': len(tokens),
-                'filters_applied': filters
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    # Get query parameters
+    project_id = request.args.get('project_id')
+    owner_address = request.args.get('owner_address')
+    status = request.args.get('status')
+    limit = _clamp_int('limit', 50)
+    offset = _clamp_int('offset', 0, lo=0, hi=1_000_000)
+    
+    # Build filters
+    filters = {}
+    if project_id:
+        filters['project_id'] = project_id
+    if owner_address:
+        filters['owner_address'] = owner_address
+    if status:
+        filters['status'] = status
+    
+    # Get from Supabase or mock data; pagination is applied by the query
+    tokens = supabase_client.get_tokens(filters, limit=limit, offset=offset)
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'tokens': tokens,
+            'count': len(tokens),
+            'filters_applied': filters
+        }
+    })
+
+def _iter_transactions(transaction_type=None, token_id=None, address=None):
+    """Yield serialized transactions matching the filters"""
+    contract = blockchain_mrv.smart_contract
+    for tx in contract.transactions_for(token_id=token_id, address=address, tx_type=transaction_type):
+        yield tx.to_dict()
 
 @blockchain_bp.route('/transactions', methods=['GET'])
 def list_transactions():
     """List blockchain transactions with filtering"""
-    try:
-        # Get query parameters
-        transaction_type = request.args.get('type')
-        token_id = request.args.get('token_id')
-        address = request.args.get('address')
-        limit = int(request.args.get('limit', 100))
-        
-        # Get all transactions from blockchain
-        all_transactions = []
-        for tx in blockchain_mrv.smart_contract.transactions:
-            tx_data = tx.to_dict()
-            
-            # Apply filters
-            if transaction_type and tx.transaction_type != transaction_type:
-                continue
-            if token_id and tx_data.get('data', {}).get('token_id') != token_id:
-                continue
-            if address and tx.from_address != address and tx.to_address != address:
-                continue
-                
-            all_transactions.append(tx_data)
-            
-        # Limit results
-        all_transactions = all_transactions[:limit]
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'transactions': all_transactions,
-                'count': len(all_transactions)
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    # Get query parameters
+    transaction_type = request.args.get('type')
+    token_id = request.args.get('token_id')
+    address = request.args.get('address')
+    limit = _clamp_int('limit', 100)
+    
+    # Stop scanning as soon as limit matches have been collected
+    all_transactions = list(islice(_iter_transactions(transaction_type, token_id, address), limit))
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'transactions': all_transactions,
+            'count': len(all_transactions)
+        }
+    })
+
+@blockchain_bp.route('/transactions.ndjson', methods=['GET'])
+def stream_transactions_ndjson():
+    """Stream matching transactions as newline-delimited JSON"""
+    transactions = _iter_transactions(
+        request.args.get('type'), request.args.get('token_id'), request.args.get('address')
+    )
+    
+    def generate():
+        for tx_data in transactions:
+            yield dumps(tx_data) + b'\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@blockchain_bp.route('/transactions/export', methods=['GET'])
+def export_transactions():
+    """Stream all matching transactions as a single JSON document"""
+    transactions = _iter_transactions(
+        request.args.get('type'), request.args.get('token_id'), request.args.get('address')
+    )
+    
+    def generate():
+        yield b'{"success":true,"data":{"transactions":['
+        count = 0
+        for tx_data in transactions:
+            yield (b',' if count else b'') + dumps(tx_data)
+            count += 1
+        yield b'],"count":' + str(count).encode() + b'}}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+def _log_sync_failures(kind, entries, synced):
+    """Report batch entries the contract applied but Supabase failed to record"""
+    failed = [entry['token_id'] for entry, ok in zip(entries, synced) if not ok]
+    if failed:
+        logger.error(f"Supabase {kind} sync failed for {len(failed)} of {len(entries)} tokens: {failed}")
 
 @blockchain_bp.route('/tokens/batch-transfer', methods=['POST'])
 def batch_transfer_tokens():
     """Execute batch token transfers"""
-    try:
-        data = request.get_json()
-        transfers = data.get('transfers', [])
-        
-        if not transfers:
-            return jsonify({
-                'success': False,
-                'error': 'No transfers provided'
-            }), 400
-            
-        # Execute batch transfer
-        results = blockchain_mrv.smart_contract.batch_transfer_tokens(transfers)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'batch_results': results,
-                'total_transfers': len(transfers),
-                'successful_transfers': len(results['successful']),
-                'failed_transfers': len(results['failed']),
-                'transaction_hash': blockchain_mrv.smart_contract.transactions[-1].tx_hash
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
+    data = request.get_json()
+    transfers = data.get('transfers', [])
+    
+    if not transfers:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No transfers provided'
+        }), 400
+        
+    # Execute batch transfer
+    results = blockchain_mrv.smart_contract.batch_transfer_tokens(transfers)
+    
+    # Update Supabase for the transfers that went through
+    if not supabase_client.mock_mode and results['successful']:
+        synced = supabase_client.transfer_tokens_bulk(results['successful'])
+        _log_sync_failures('transfer', results['successful'], synced)
+    
+    _invalidate_caches()
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'batch_results': results,
+            'total_transfers': len(transfers),
+            'successful_transfers': len(results['successful']),
+            'failed_transfers': len(results['failed']),
+            'transaction_hash': results['batch_tx_hash']
+        }
+    })
 
 @blockchain_bp.route('/tokens/batch-retire', methods=['POST'])
 def batch_retire_tokens():
     """Execute batch token retirements"""
-    try:
-        data = request.get_json()
-        retirements = data.get('retirements', [])
-        
-        if not retirements:
-            return jsonify({
-                'success': False,
-                'error': 'No retirements provided'
-            }), 400
-            
-        # Execute batch retirement
-        results = blockchain_mrv.smart_contract.batch_retire_tokens(retirements)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'batch_results': results,
-                'total_retirements': len(retirements),
-                'successful_retirements': len(results['successful']),
-                'failed_retirements': len(results['failed']),
-                'transaction_hash': blockchain_mrv.smart_contract.transactions[-1].tx_hash
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
+    data = request.get_json()
+    retirements = data.get('retirements', [])
+    
+    if not retirements:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No retirements provided'
+        }), 400
+        
+    # Execute batch retirement
+    results = blockchain_mrv.smart_contract.batch_retire_tokens(retirements)
+    
+    # Update Supabase for the retirements that went through
+    if not supabase_client.mock_mode and results['successful']:
+        synced = supabase_client.retire_tokens_bulk(results['successful'])
+        _log_sync_failures('retirement', results['successful'], synced)
+    
+    _invalidate_caches()
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'batch_results': results,
+            'total_retirements': len(retirements),
+            'successful_retirements': len(results['successful']),
+            'failed_retirements': len(results['failed']),
+            'transaction_hash': results['batch_tx_hash']
+        }
+    })
 
 @blockchain_bp.route('/addresses/<address>/portfolio', methods=['GET'])
+@_etag_by_state_version
 def get_address_portfolio(address):
     """Get complete token portfolio for an address"""
-    try:
-        portfolio = blockchain_mrv.smart_contract.get_address_portfolio(address)
-        
-        return jsonify({
-            'success': True,
-            'data': portfolio
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    portfolio = blockchain_mrv.smart_contract.get_address_portfolio(address)
+    
+    return ojson({
+        'success': True,
+        'data': portfolio
+    })
 
 @blockchain_bp.route('/tokens/vintage/<int:vintage_year>', methods=['GET'])
+@_etag_by_state_version
 def get_tokens_by_vintage(vintage_year):
     """Get all tokens from a specific vintage year"""
-    try:
-        tokens = blockchain_mrv.smart_contract.get_tokens_by_vintage(vintage_year)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'vintage_year': vintage_year,
-                'tokens': tokens,
-                'count': len(tokens),
-                'total_credits': sum(token['credits_amount'] for token in tokens)
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    contract = blockchain_mrv.smart_contract
+    tokens = contract.get_tokens_by_vintage(vintage_year)
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'vintage_year': vintage_year,
+            'tokens': tokens,
+            'count': len(tokens),
+            'total_credits': contract.credits_for_vintage(vintage_year)
+        }
+    })
 
 @blockchain_bp.route('/projects/<project_id>/tokens', methods=['GET'])
+@_etag_by_state_version
 def get_project_tokens(project_id):
     """Get all tokens for a specific project"""
-    try:
-        tokens = blockchain_mrv.smart_contract.get_tokens_by_project(project_id)
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'project_id': project_id,
-                'tokens': tokens,
-                'count': len(tokens),
-                'total_credits': sum(token['credits_amount'] for token in tokens)
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    contract = blockchain_mrv.smart_contract
+    tokens = contract.get_tokens_by_project(project_id)
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'project_id': project_id,
+            'tokens': tokens,
+            'count': len(tokens),
+            'total_credits': contract.credits_for_project(project_id)
+        }
+    })
 
 @blockchain_bp.route('/retirements', methods=['GET'])
 def get_retirement_history():
     """Get retirement history with optional address filter"""
-    try:
-        address = request.args.get('address')
-        limit = int(request.args.get('limit', 100))
-        
-        retirements = blockchain_mrv.smart_contract.get_retirement_history(address)
-        retirements = retirements[:limit]
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'retirements': retirements,
-                'count': len(retirements),
-                'filtered_by_address': address
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    address = request.args.get('address')
+    limit = _clamp_int('limit', 100)
+    
+    retirements = blockchain_mrv.smart_contract.get_retirement_history(address, limit=limit)
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'retirements': retirements,
+            'count': len(retirements),
+            'filtered_by_address': address
+        }
+    })
 
 @blockchain_bp.route('/visualization/token-flow', methods=['GET'])
 def get_token_flow_visualization():
     """Get token flow visualization data"""
-    try:
-        project_id = request.args.get('project_id')
-        timeframe_days = int(request.args.get('timeframe_days', 365))
-        
-        # Generate visualization data
-        viz_data = token_viz_engine.generate_token_flow_visualization(
+    project_id = request.args.get('project_id')
+    timeframe_days = _clamp_int('timeframe_days', 365, hi=3650)
+    
+    # Generate visualization data
+    viz_data = _cached_viz(
+        ('token_flow', project_id, timeframe_days),
+        lambda: token_viz_engine.generate_token_flow_visualization(
             project_id=project_id,
             timeframe_days=timeframe_days
         )
-        
-        return jsonify({
-            'success': True,
-            'data': viz_data
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    )
+    
+    return ojson({
+        'success': True,
+        'data': viz_data
+    })
 
 @blockchain_bp.route('/visualization/real-time-dashboard', methods=['GET'])
 def get_real_time_dashboard():
     """Get real-time blockchain dashboard data"""
-    try:
-        project_id = request.args.get('project_id')
-        
-        # Generate dashboard data
-        dashboard_data = token_viz_engine.create_real_time_dashboard_data(
+    project_id = request.args.get('project_id')
+    
+    # Generate dashboard data
+    dashboard_data = _cached_viz(
+        ('dashboard', project_id, None),
+        lambda: token_viz_engine.create_real_time_dashboard_data(
             project_id=project_id
         )
-        
-        return jsonify({
-            'success': True,
-            'data': dashboard_data,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    )
+    
+    return ojson({
+        'success': True,
+        'data': dashboard_data,
+        'timestamp': g.now_iso
+    })
 
 @blockchain_bp.route('/verify-transaction/<tx_hash>', methods=['GET'])
 def verify_transaction(tx_hash):
     """Verify a blockchain transaction by hash"""
-    try:
-        # Find transaction in blockchain simulation
-        transaction = None
-        for tx in blockchain_mrv.smart_contract.transactions:
-            if tx.tx_hash == tx_hash:
-                transaction = tx.to_dict()
-                break
-        
-        if not transaction:
-            return jsonify({
-                'success': False,
-                'error': 'Transaction not found'
-            }), 404
-        
-        # Add verification info
-        verification_data = {
-            'transaction': transaction,
-            'verified': True,
-            'confirmations': transaction.get('confirmations', 6),
-            'network': 'BlueCarbon-Testnet',
-            'verified_at': datetime.now().isoformat()
-        }
-        
-        return jsonify({
-            'success': True,
-            'data': verification_data
-        })
-        
-    except Exception as e:
-        return jsonify({
+    # Find transaction in blockchain simulation
+    tx = blockchain_mrv.smart_contract.get_transaction(tx_hash)
+    transaction = tx.to_dict() if tx else None
+    
+    if not transaction:
+        return ojson({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'Transaction not found'
+        }), 404
+    
+    # Add verification info
+    verification_data = {
+        'transaction': transaction,
+        'verified': True,
+        'confirmations': transaction.get('confirmations', 6),
+        'network': 'BlueCarbon-Testnet',
+        'verified_at': g.now_iso
+    }
+    
+    return ojson({
+        'success': True,
+        'data': verification_data
+    })
 
 @blockchain_bp.route('/wallet/<address>/balance', methods=['GET'])
 def get_wallet_balance(address):
     """Get carbon credit balance for a wallet address"""
-    try:
-        total_balance = 0
-        active_tokens = []
-        
-        # Check all tokens owned by this address
-        for token_id, token in blockchain_mrv.smart_contract.tokens.items():
-            if token.owner_address == address and not token.retired:
-                total_balance += token.credits_amount
-                active_tokens.append({
-                    'token_id': token_id,
-                    'project_id': token.project_id,
-                    'credits_amount': token.credits_amount,
-                    'mint_date': datetime.fromtimestamp(token.mint_timestamp).isoformat()
-                })
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'address': address,
-                'total_balance': total_balance,
-                'active_tokens': active_tokens,
-                'tokens_count': len(active_tokens)
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    # Let Postgres aggregate the balance in one round-trip when available
+    if not supabase_client.mock_mode:
+        wallet = supabase_client.get_wallet_balance(address)
+        if wallet is not None:
+            return ojson({
+                'success': True,
+                'data': {
+                    'address': address,
+                    **wallet
+                }
+            })
+    
+    total_balance = 0
+    active_tokens = []
+    
+    # Check only the tokens owned by this address
+    for token in blockchain_mrv.smart_contract.get_tokens_by_owner(address):
+        if not token.retired:
+            total_balance += token.credits_amount
+            active_tokens.append({
+                'token_id': token.token_id,
+                'project_id': token.project_id,
+                'credits_amount': token.credits_amount,
+                'mint_date': _iso(token.mint_timestamp)
+            })
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'address': address,
+            'total_balance': total_balance,
+            'active_tokens': active_tokens,
+            'tokens_count': len(active_tokens)
+        }
+    })
 
 @blockchain_bp.route('/smart-contract/info', methods=['GET'])
+@_etag_by_state_version
 def get_smart_contract_info():
     """Get smart contract information and statistics"""
-    try:
-        contract = blockchain_mrv.smart_contract
-        
-        contract_info = {
-            'contract_address': contract.contract_address,
-            'deployed_at': datetime.fromtimestamp(contract.deployed_timestamp).isoformat(),
-            'total_supply': contract.total_supply,
-            'retired_supply': contract.retired_supply,
-            'active_supply': contract.total_supply - contract.retired_supply,
-            'total_tokens': len(contract.tokens),
-            'active_tokens': len([t for t in contract.tokens.values() if not t.retired]),
-            'total_transactions': len(contract.transactions),
-            'transaction_types': {
-                'mint': len([t for t in contract.transactions if t.transaction_type == 'credit_mint']),
-                'transfer': len([t for t in contract.transactions if t.transaction_type == 'credit_transfer']),
-                'retire': len([t for t in contract.transactions if t.transaction_type == 'credit_retire'])
-            }
+    contract = blockchain_mrv.smart_contract
+    type_counts = contract.transaction_type_counts()
+    
+    contract_info = {
+        'contract_address': contract.contract_address,
+        'deployed_at': _iso(contract.deployed_timestamp),
+        'total_supply': contract.total_supply,
+        'retired_supply': contract.retired_supply,
+        'active_supply': contract.total_supply - contract.retired_supply,
+        'total_tokens': len(contract.tokens),
+        'active_tokens': contract.active_token_count(),
+        'total_transactions': len(contract.transactions),
+        'transaction_types': {
+            'mint': type_counts.get('credit_mint', 0),
+            'transfer': type_counts.get('credit_transfer', 0),
+            'retire': type_counts.get('credit_retire', 0)
         }
-        
-        return jsonify({
-            'success': True,
-            'data': contract_info
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    }
+    
+    return ojson({
+        'success': True,
+        'data': contract_info
+    })
 
 # WebSocket events for real-time updates
 @blockchain_bp.route('/events/subscribe', methods=['POST'])
 def subscribe_to_blockchain_events():
     """Subscribe to real-time blockchain events"""
-    try:
-        data = request.get_json()
-        event_types = data.get('events', ['all'])
-        callback_url = data.get('callback_url')
-        
-        # In a real implementation, this would set up WebSocket or webhook subscriptions
-        subscription_id = f"sub_{int(time.time())}"
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'subscription_id': subscription_id,
-                'events': event_types,
-                'callback_url': callback_url,
-                'created_at': datetime.now().isoformat()
-            }
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
\ No newline at end of file
+    data = request.get_json()
+    event_types = data.get('events', ['all'])
+    callback_url = data.get('callback_url')
+    
+    # In a real implementation, this would set up WebSocket or webhook subscriptions
+    subscription_id = f"sub_{int(time.time())}"
+    
+    return ojson({
+        'success': True,
+        'data': {
+            'subscription_id': subscription_id,
+            'events': event_types,
+            'callback_url': callback_url,
+            'created_at': g.now_iso
+        }
+    })
\ No newline at end of file
@@ -6,12 +6,70 @@ Simulates blockchain functionality including smart contracts and tokenization
 import hashlib
 import time
 import json
+from collections import Counter, defaultdict
+from itertools import count, islice
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# OpenSSL-backed SHA-256; OpenSSL picks SHA-NI / ARMv8 crypto instructions at runtime when available.
+# Batch operations hash each child transaction through this too: hashlib has no multi-buffer API, and
+# with SHA-NI a sub-kilobyte digest is already cheaper than the canonical JSON that feeds it.
+_sha256 = hashlib.sha256
+
+# Key for deriving a project's owner address; keyed so addresses are scoped to this contract
+_OWNER_ADDRESS_KEY = b"bluecarbon-mrv-owner-address"
+
+def _owner_address_for(project_id: str) -> str:
+    """Derive the initial owner address for a project's tokens"""
+    return "0x" + hashlib.blake2b(project_id.encode(), digest_size=20, key=_OWNER_ADDRESS_KEY).hexdigest()
+
+def _json_default(obj):
+    """JSON serializer for objects not serializable by default json code"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def _canonical_json(obj) -> bytes:
+    """Compact, key-sorted JSON bytes used as hashing input"""
+    # Always the stdlib encoder: hashes must not depend on which optional packages are installed
+    # (orjson differs on NaN, float exponents, big ints and non-string keys)
+    return json.dumps(obj, sort_keys=True, default=_json_default,
+                      separators=(',', ':'), ensure_ascii=False).encode()
+
+# Process-wide sequences for transfer / retirement record ids (next() on a count is atomic under the GIL)
+_next_transfer_seq = count(1).__next__
+_next_retirement_seq = count(1).__next__
+
+_JSON_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+def _sanitize_for_json(data):
+    """Recursively convert datetimes to ISO strings, rebuilding dicts and lists"""
+    # Exact-type checks first: one set/identity test per node instead of an isinstance chain
+    data_type = type(data)
+    if data_type in _JSON_SCALAR_TYPES:
+        return data
+    if data_type is dict:
+        return {k: _sanitize_for_json(v) for k, v in data.items()}
+    if data_type is list:
+        return [_sanitize_for_json(v) for v in data]
+    if data_type is datetime:
+        return data.isoformat()
+    
+    # Subclasses (OrderedDict, pandas Timestamp, ...) take the general path
+    if isinstance(data, dict):
+        return {k: _sanitize_for_json(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_sanitize_for_json(v) for v in data]
+    if isinstance(data, datetime):
+        return data.isoformat()
+    return data
 
 class BlockchainTransaction:
     """Represents a blockchain transaction"""
     
+    __slots__ = ('timestamp', 'transaction_type', 'data', 'from_address', 'to_address',
+                 'tx_hash', 'block_number', 'confirmations', '_dict')
+    
     def __init__(self, transaction_type: str, data: dict, from_address: str = None, to_address: str = None):
         self.timestamp = time.time()
         self.transaction_type = transaction_type  # 'project_submit', 'credit_issue', 'credit_transfer', 'credit_retire'
@@ -21,44 +79,52 @@ class BlockchainTransaction:
         self.tx_hash = self._generate_hash()
         self.block_number = None
         self.confirmations = 0
+        self._dict = None  # serialized form, built on first to_dict()
         
-    def _json_default(self, obj):
-        """JSON serializer for objects not serializable by default json code"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return str(obj)
-
     def _generate_hash(self) -> str:
         """Generate transaction hash"""
-        transaction_string = f"{self.timestamp}{self.transaction_type}{json.dumps(self.data, sort_keys=True, default=self._json_default)}"
-        return hashlib.sha256(transaction_string.encode()).hexdigest()
+        tx_hasher = _sha256(f"{self.timestamp}{self.transaction_type}".encode())
+        tx_hasher.update(_canonical_json(self.data))
+        return tx_hasher.hexdigest()
     
     def to_dict(self) -> dict:
-        return {
-            'tx_hash': self.tx_hash,
-            'timestamp': self.timestamp,
-            'datetime': datetime.fromtimestamp(self.timestamp).isoformat(),
-            'type': self.transaction_type,
-            'data': self.data,
-            'from_address': self.from_address,
-            'to_address': self.to_address,
-            'block_number': self.block_number,
-            'confirmations': self.confirmations
-        }
+        # Transactions are not modified once recorded, so the dict is built once;
+        # callers get a shallow copy they may annotate
+        if self._dict is None:
+            self._dict = {
+                'tx_hash': self.tx_hash,
+                'timestamp': self.timestamp,
+                'datetime': datetime.fromtimestamp(self.timestamp).isoformat(),
+                'type': self.transaction_type,
+                'data': self.data,
+                'from_address': self.from_address,
+                'to_address': self.to_address,
+                'block_number': self.block_number,
+                'confirmations': self.confirmations
+            }
+        return dict(self._dict)
 
 class CarbonCreditToken:
     """Enhanced carbon credit token with advanced features"""
     
-    def __init__(self, token_id: str, project_id: str, credits_amount: float, metadata: dict):
+    __slots__ = ('token_id', 'project_id', 'credits_amount', 'available_amount', 'metadata',
+                 'owner_address', 'mint_timestamp', 'transfers', 'retirements', 'retired_total',
+                 'retired', 'retirement_timestamp', 'fractional_owners', 'locked_amounts',
+                 'vintage_year', 'certification_standard', 'additional_attributes',
+                 '_dict_cache', '_owner_may_not_be_max')
+    
+    def __init__(self, token_id: str, project_id: str, credits_amount: float, metadata: dict,
+                 owner_address: Optional[str] = None):
         self.token_id = token_id
         self.project_id = project_id
         self.credits_amount = credits_amount  # tCO2e
         self.available_amount = credits_amount  # Amount available for transfer/retirement
         self.metadata = metadata
-        self.owner_address = "0x" + hashlib.md5(project_id.encode()).hexdigest()[:40]
+        self.owner_address = owner_address or _owner_address_for(project_id)
         self.mint_timestamp = time.time()
         self.transfers = []
         self.retirements = []  # Track partial retirements
+        self.retired_total = 0  # Running sum of retirement amounts
         self.retired = False
         self.retirement_timestamp = None
         self.fractional_owners = {self.owner_address: credits_amount}  # Track fractional ownership
@@ -66,36 +132,46 @@ class CarbonCreditToken:
         self.vintage_year = metadata.get('vintage_year', datetime.now().year)
         self.certification_standard = metadata.get('standard', 'VCS')
         self.additional_attributes = metadata.get('attributes', {})
+        self._dict_cache = None  # serialized form; cleared whenever balances change
+        self._owner_may_not_be_max = False  # set when the owner retires part of their balance
         
     def transfer(self, from_address: str, to_address: str, amount: float = None) -> bool:
         """Transfer tokens with fractional ownership support"""
         if self.retired:
             return False
             
-        transfer_amount = amount or self.fractional_owners.get(from_address, 0)
+        owners = self.fractional_owners
+        from_balance = owners.get(from_address)
+        transfer_amount = amount or from_balance or 0
         
         # Check if sender has enough balance
-        if from_address not in self.fractional_owners or self.fractional_owners[from_address] < transfer_amount:
+        if from_balance is None or from_balance < transfer_amount:
             return False
             
         if transfer_amount <= 0:
             return False
             
-        # Execute transfer
-        self.fractional_owners[from_address] -= transfer_amount
-        
-        # Remove zero balances
-        if self.fractional_owners[from_address] <= 0:
-            del self.fractional_owners[from_address]
+        # Execute transfer, removing zero balances
+        remaining = from_balance - transfer_amount
+        if remaining <= 0:
+            del owners[from_address]
+        else:
+            owners[from_address] = remaining
         
         # Add to recipient
-        if to_address in self.fractional_owners:
-            self.fractional_owners[to_address] += transfer_amount
-        else:
-            self.fractional_owners[to_address] = transfer_amount
-            
-        # Update primary owner to largest holder
-        self.owner_address = max(self.fractional_owners, key=self.fractional_owners.get)
+        owners[to_address] = owners.get(to_address, 0) + transfer_amount
+            
+        # Update primary owner to largest holder; only the two changed balances can move it,
+        # so rescan only when the owner's own balance dropped or a tie needs dict-order resolution
+        owner_balance = owners.get(self.owner_address)
+        if self._owner_may_not_be_max or from_address == self.owner_address or owner_balance is None:
+            self.owner_address = max(owners, key=owners.get)
+            self._owner_may_not_be_max = False
+        elif to_address != self.owner_address:
+            if owners[to_address] > owner_balance:
+                self.owner_address = to_address
+            elif owners[to_address] == owner_balance:
+                self.owner_address = max(owners, key=owners.get)
         
         # Record transfer
         self.transfers.append({
@@ -103,8 +179,9 @@ class CarbonCreditToken:
             'to': to_address,
             'amount': transfer_amount,
             'timestamp': time.time(),
-            'transaction_id': hashlib.sha256(f"{from_address}{to_address}{transfer_amount}{time.time()}".encode()).hexdigest()[:16]
+            'transaction_id': f"t{_next_transfer_seq():015x}"
         })
+        self._dict_cache = None
         
         return True
         
@@ -121,6 +198,8 @@ class CarbonCreditToken:
             
         # Execute partial retirement
         self.fractional_owners[owner_address] -= amount
+        if owner_address == self.owner_address:
+            self._owner_may_not_be_max = True
         self.available_amount -= amount
         
         # Remove zero balances
@@ -133,15 +212,17 @@ class CarbonCreditToken:
             'amount': amount,
             'reason': retire_reason,
             'timestamp': time.time(),
-            'retirement_id': hashlib.sha256(f"{owner_address}{amount}{time.time()}".encode()).hexdigest()[:16]
+            'retirement_id': f"r{_next_retirement_seq():015x}"
         }
         self.retirements.append(retirement_record)
+        self.retired_total += amount
         
         # Check if fully retired
         if self.available_amount <= 0:
             self.retired = True
             self.retirement_timestamp = time.time()
-            
+        
+        self._dict_cache = None
         return True
         
     def get_balance(self, address: str) -> float:
@@ -150,10 +231,16 @@ class CarbonCreditToken:
         
     def get_total_retired(self) -> float:
         """Get total amount retired"""
-        return sum(r['amount'] for r in self.retirements)
+        return self.retired_total
     
     
     def to_dict(self) -> dict:
+        # Rebuilt only after a transfer or retirement; callers get a shallow copy they may annotate
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return dict(self._dict_cache)
+    
+    def _build_dict(self) -> dict:
         return {
             'token_id': self.token_id,
             'project_id': self.project_id,
@@ -175,6 +262,49 @@ class CarbonCreditToken:
             'metadata': self.metadata
         }
 
+def _new_breakdown() -> dict:
+    return {'total': 0, 'retired': 0, 'active': 0}
+
+class _PagedLog:
+    """Append-only sequence stored in fixed-size pages, so growth never copies earlier entries"""
+    
+    __slots__ = ('_pages', '_tail', '_len')
+    
+    PAGE_SIZE = 65536
+    
+    def __init__(self):
+        self._tail = []
+        self._pages = [self._tail]
+        self._len = 0
+        
+    def append(self, item):
+        if len(self._tail) == self.PAGE_SIZE:
+            self._tail = []
+            self._pages.append(self._tail)
+        self._tail.append(item)
+        self._len += 1
+        
+    def __len__(self) -> int:
+        return self._len
+    
+    def __iter__(self):
+        for page in self._pages:
+            yield from page
+            
+    def __reversed__(self):
+        for page in reversed(self._pages):
+            yield from reversed(page)
+            
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('log index out of range')
+        page, offset = divmod(index, self.PAGE_SIZE)
+        return self._pages[page][offset]
+
 class SmartContract:
     """Simulates smart contract functionality for carbon credits"""
     
@@ -182,23 +312,152 @@ class SmartContract:
         self.contract_address = contract_address
         self.deployed_timestamp = time.time()
         self.tokens = {}  # token_id -> CarbonCreditToken
-        self.transactions = []
+        self.transactions = _PagedLog()
         self.total_supply = 0.0
         self.retired_supply = 0.0
         
-    def mint_tokens(self, project_id: str, credits_amount: float, metadata: dict) -> str:
-        """Mint new carbon credit tokens"""
+        # Secondary transaction indexes, maintained by _record_transaction
+        self._tx_by_hash = {}
+        self._tx_by_type = defaultdict(list)
+        self._tx_by_addr = defaultdict(list)
+        self._tx_by_token = defaultdict(list)
+        self._type_counts = Counter()
+        
+        # Active (not fully retired) token ids by primary owner address; dicts keep mint order
+        self._tokens_by_owner = defaultdict(dict)
+        
+        # Token ids each address holds a non-zero balance in (fractional holders included)
+        self._holdings_by_addr = defaultdict(dict)
+        
+        # Token counts by retirement state, maintained on mint/retire
+        self._active_token_count = 0
+        self._partially_retired_count = 0
+        self._fully_retired_count = 0
+        
+        # Canonical instance of every address seen, so balance and index lookups compare by identity
+        self._address_intern = {}
+        
+        # Last suffix used for token ids minted for the same project within one second
+        self._token_id_suffixes = {}
+        
+        # Append-only retirement records, overall and by retiring address
+        self._retirements = _PagedLog()
+        self._retirements_by_addr = defaultdict(list)
+        
+        # Running minted-credit totals per project and vintage year
+        self._credits_by_project = defaultdict(float)
+        self._credits_by_vintage = defaultdict(float)
+        
+        # Supply breakdowns by vintage, certification standard and project, maintained on mint/retire
+        self._vintage_breakdown = defaultdict(_new_breakdown)
+        self._standard_breakdown = defaultdict(_new_breakdown)
+        self._project_breakdown = defaultdict(_new_breakdown)
+        
+        # Bumped on every recorded transaction; lets readers detect unchanged state
+        self.state_version = 0
+        
+    def _record_transaction(self, tx: BlockchainTransaction):
+        """Append a transaction to the ledger and its lookup indexes"""
+        self.state_version += 1
+        self.transactions.append(tx)
+        self._tx_by_hash[tx.tx_hash] = tx
+        self._tx_by_type[tx.transaction_type].append(tx)
+        self._type_counts[tx.transaction_type] += 1
+        if tx.from_address:
+            self._tx_by_addr[tx.from_address].append(tx)
+        if tx.to_address and tx.to_address != tx.from_address:
+            self._tx_by_addr[tx.to_address].append(tx)
+        token_id = tx.data.get('token_id')
+        if token_id:
+            self._tx_by_token[token_id].append(tx)
+    
+    def _update_breakdowns(self, token: CarbonCreditToken, total: float = 0, retired: float = 0, active: float = 0):
+        """Apply a supply change for a token to its vintage, standard and project breakdowns"""
+        for breakdown in (self._vintage_breakdown[token.vintage_year],
+                          self._standard_breakdown[token.certification_standard],
+                          self._project_breakdown[token.project_id]):
+            breakdown['total'] += total
+            breakdown['retired'] += retired
+            breakdown['active'] += active
+    
+    def _intern_address(self, address: Optional[str]) -> Optional[str]:
+        """Return the canonical instance of an address string, registering it if new"""
+        if address is None:
+            return None
+        return self._address_intern.setdefault(address, address)
+    
+    def _canonical_address(self, address: Optional[str]) -> Optional[str]:
+        """Canonical instance of an already registered address, else the string itself
+        
+        Used for addresses from requests, which are registered only once the ledger holds them,
+        so rejected calls cannot grow the intern table.
+        """
+        return self._address_intern.get(address, address)
+    
+    def _sync_holding(self, token: CarbonCreditToken, address: str):
+        """Add or drop a token from an address's holdings after its balance changed"""
+        if token.get_balance(address) > 0:
+            self._holdings_by_addr[address][token.token_id] = None
+        else:
+            holdings = self._holdings_by_addr.get(address)
+            if holdings is not None:
+                holdings.pop(token.token_id, None)
+    
+    def get_transaction(self, tx_hash: str) -> Optional[BlockchainTransaction]:
+        """Look up a transaction by hash"""
+        return self._tx_by_hash.get(tx_hash)
+    
+    def transactions_for(self, token_id: str = None, address: str = None,
+                         tx_type: str = None) -> Iterator[BlockchainTransaction]:
+        """Iterate transactions matching all given filters, in ledger order"""
+        # Start from the most selective index available
+        if token_id:
+            source = self._tx_by_token.get(token_id, ())
+        elif address:
+            source = self._tx_by_addr.get(address, ())
+        elif tx_type:
+            source = self._tx_by_type.get(tx_type, ())
+        else:
+            source = self.transactions
+        
+        for tx in source:
+            if tx_type and tx.transaction_type != tx_type:
+                continue
+            if token_id and tx.data.get('token_id') != token_id:
+                continue
+            if address and tx.from_address != address and tx.to_address != address:
+                continue
+            yield tx
+    
+    def transaction_type_counts(self) -> Dict[str, int]:
+        """Number of transactions recorded per transaction type"""
+        return dict(self._type_counts)
+        
+    def mint_tokens(self, project_id: str, credits_amount: float, metadata: dict) -> Tuple[str, str]:
+        """Mint new carbon credit tokens, returning (token_id, tx_hash)"""
         token_id = f"CC_{project_id}_{int(time.time())}"
+        if token_id in self.tokens:
+            # Same project minted again within the second; disambiguate instead of overwriting
+            seq = self._token_id_suffixes[token_id] = self._token_id_suffixes.get(token_id, 1) + 1
+            token_id = f"{token_id}_{seq}"
         
+        owner_address = self._intern_address(_owner_address_for(project_id))
         token = CarbonCreditToken(
             token_id=token_id,
             project_id=project_id,
             credits_amount=credits_amount,
-            metadata=metadata
+            metadata=metadata,
+            owner_address=owner_address
         )
         
         self.tokens[token_id] = token
         self.total_supply += credits_amount
+        self._tokens_by_owner[owner_address][token_id] = None
+        self._holdings_by_addr[owner_address][token_id] = None
+        self._active_token_count += 1
+        self._credits_by_project[project_id] += credits_amount
+        self._credits_by_vintage[token.vintage_year] += credits_amount
+        self._update_breakdowns(token, total=credits_amount, active=credits_amount)
         
         # Create transaction
         tx = BlockchainTransaction(
@@ -209,24 +468,33 @@ class SmartContract:
                 'credits_amount': credits_amount,
                 'metadata': metadata
             },
-            to_address=token.owner_address
+            to_address=owner_address
         )
         
-        self.transactions.append(tx)
-        return token_id
+        self._record_transaction(tx)
+        return token_id, tx.tx_hash
     
-    def transfer_tokens(self, token_id: str, from_address: str, to_address: str, amount: float = None) -> bool:
-        """Transfer tokens between addresses with enhanced fractional support"""
+    def transfer_tokens(self, token_id: str, from_address: str, to_address: str, amount: float = None) -> Optional[str]:
+        """Transfer tokens between addresses; returns the transaction hash, or None on failure"""
         if token_id not in self.tokens:
-            return False
-            
+            return None
         token = self.tokens[token_id]
         
         # Check if sender has balance in this token
         if token.get_balance(from_address) <= 0:
-            return False
+            return None
+        from_address = self._canonical_address(from_address)
+        to_address = self._canonical_address(to_address)
             
+        previous_owner = token.owner_address
         if token.transfer(from_address, to_address, amount):
+            self._intern_address(to_address)
+            if token.owner_address != previous_owner:
+                self._tokens_by_owner[previous_owner].pop(token_id, None)
+                self._tokens_by_owner[token.owner_address][token_id] = None
+            self._sync_holding(token, from_address)
+            self._sync_holding(token, to_address)
+            
             # Create transaction
             actual_amount = amount or token.get_balance(from_address)
             tx = BlockchainTransaction(
@@ -243,29 +511,33 @@ class SmartContract:
                 to_address=to_address
             )
             
-            self.transactions.append(tx)
-            return True
+            self._record_transaction(tx)
+            return tx.tx_hash
             
-        return False
+        return None
         
     def batch_transfer_tokens(self, transfers: list) -> dict:
         """Execute multiple token transfers in a single batch"""
         results = {'successful': [], 'failed': []}
         
+        # Applied sequentially on purpose: a later entry may spend a balance an earlier one created,
+        # and the contract's ledger and indexes are not safe for concurrent mutation
         for transfer in transfers:
             token_id = transfer.get('token_id')
             from_address = transfer.get('from_address')
             to_address = transfer.get('to_address')
             amount = transfer.get('amount')
             
-            success = self.transfer_tokens(token_id, from_address, to_address, amount)
+            tx_hash = self.transfer_tokens(token_id, from_address, to_address, amount)
+            success = tx_hash is not None
             
             transfer_result = {
                 'token_id': token_id,
                 'from_address': from_address,
                 'to_address': to_address,
                 'amount': amount,
-                'success': success
+                'success': success,
+                'tx_hash': tx_hash
             }
             
             if success:
@@ -284,24 +556,44 @@ class SmartContract:
             }
         )
         
-        self.transactions.append(batch_tx)
-        return results
+        self._record_transaction(batch_tx)
+        return {**results, 'batch_tx_hash': batch_tx.tx_hash}
     
-    def retire_tokens(self, token_id: str, owner_address: str, amount: float = None, reason: str = "Carbon offsetting") -> bool:
-        """Retire tokens permanently with partial retirement support"""
+    def retire_tokens(self, token_id: str, owner_address: str, amount: float = None, reason: str = "Carbon offsetting") -> Optional[str]:
+        """Retire tokens permanently; returns the transaction hash, or None on failure"""
         if token_id not in self.tokens:
-            return False
-            
+            return None
         token = self.tokens[token_id]
         
         # Check if owner has balance in this token
         if token.get_balance(owner_address) <= 0:
-            return False
+            return None
+        # A holder's address entered the table when it first received credits
+        owner_address = self._canonical_address(owner_address)
             
         retire_amount = amount or token.get_balance(owner_address)
+        had_retirements = token.get_total_retired() > 0
         
         if token.partial_retire(owner_address, retire_amount, reason):
             self.retired_supply += retire_amount
+            self._update_breakdowns(token, retired=retire_amount, active=-retire_amount)
+            if token.retired:
+                self._tokens_by_owner[token.owner_address].pop(token_id, None)
+                self._active_token_count -= 1
+                self._fully_retired_count += 1
+                if had_retirements:
+                    self._partially_retired_count -= 1
+            elif not had_retirements:
+                self._partially_retired_count += 1
+            self._sync_holding(token, owner_address)
+            
+            retirement_record = {
+                'token_id': token.token_id,
+                'project_id': token.project_id,
+                **token.retirements[-1]
+            }
+            self._retirements.append(retirement_record)
+            self._retirements_by_addr[owner_address].append(retirement_record)
             
             # Create transaction
             tx = BlockchainTransaction(
@@ -318,29 +610,32 @@ class SmartContract:
                 from_address=owner_address
             )
             
-            self.transactions.append(tx)
-            return True
+            self._record_transaction(tx)
+            return tx.tx_hash
             
-        return False
+        return None
         
     def batch_retire_tokens(self, retirements: list) -> dict:
         """Execute multiple token retirements in a single batch"""
         results = {'successful': [], 'failed': []}
         
+        # Applied sequentially for the same reasons as batch_transfer_tokens
         for retirement in retirements:
             token_id = retirement.get('token_id')
             owner_address = retirement.get('owner_address')
             amount = retirement.get('amount')
             reason = retirement.get('reason', 'Carbon offsetting')
             
-            success = self.retire_tokens(token_id, owner_address, amount, reason)
+            tx_hash = self.retire_tokens(token_id, owner_address, amount, reason)
+            success = tx_hash is not None
             
             retirement_result = {
                 'token_id': token_id,
                 'owner_address': owner_address,
                 'amount': amount,
                 'reason': reason,
-                'success': success
+                'success': success,
+                'tx_hash': tx_hash
             }
             
             if success:
@@ -359,8 +654,8 @@ class SmartContract:
             }
         )
         
-        self.transactions.append(batch_tx)
-        return results
+        self._record_transaction(batch_tx)
+        return {**results, 'batch_tx_hash': batch_tx.tx_hash}
     
     def get_token_info(self, token_id: str) -> Optional[dict]:
         """Get token information"""
@@ -374,6 +669,10 @@ class SmartContract:
             return self.tokens[token_id].get_balance(address)
         return 0.0
         
+    def get_tokens_by_owner(self, address: str) -> List[CarbonCreditToken]:
+        """Get active tokens whose primary owner is the given address"""
+        return [self.tokens[token_id] for token_id in self._tokens_by_owner.get(address, ())]
+        
     def get_address_portfolio(self, address: str) -> dict:
         """Get complete token portfolio for an address"""
         portfolio = {
@@ -383,24 +682,21 @@ class SmartContract:
             'transactions': []
         }
         
-        for token_id, token in self.tokens.items():
+        for token_id in self._holdings_by_addr.get(address, ()):
+            token = self.tokens[token_id]
             balance = token.get_balance(address)
-            if balance > 0:
-                portfolio['tokens'].append({
-                    'token_id': token_id,
-                    'project_id': token.project_id,
-                    'balance': balance,
-                    'vintage_year': token.vintage_year,
-                    'certification_standard': token.certification_standard
-                })
-                portfolio['total_balance'] += balance
+            portfolio['tokens'].append({
+                'token_id': token_id,
+                'project_id': token.project_id,
+                'balance': balance,
+                'vintage_year': token.vintage_year,
+                'certification_standard': token.certification_standard
+            })
+            portfolio['total_balance'] += balance
                 
         # Get transactions involving this address
-        for tx in self.transactions:
-            if (tx.from_address == address or 
-                tx.to_address == address or 
-                (hasattr(tx.data, 'owner_address') and tx.data.get('owner_address') == address)):
-                portfolio['transactions'].append(tx.to_dict())
+        for tx in self._tx_by_addr.get(address, ()):
+            portfolio['transactions'].append(tx.to_dict())
                 
         return portfolio
         
@@ -418,55 +714,34 @@ class SmartContract:
             if token.project_id == project_id
         ]
         
-    def get_retirement_history(self, address: str = None) -> list:
-        """Get retirement history, optionally filtered by address"""
-        retirements = []
-        
-        for token in self.tokens.values():
-            for retirement in token.retirements:
-                if address is None or retirement['owner'] == address:
-                    retirement_record = {
-                        'token_id': token.token_id,
-                        'project_id': token.project_id,
-                        **retirement
-                    }
-                    retirements.append(retirement_record)
-                    
-        return sorted(retirements, key=lambda x: x['timestamp'], reverse=True)
+    def active_token_count(self) -> int:
+        """Number of tokens not yet fully retired"""
+        return self._active_token_count
+        
+    def credits_for_vintage(self, vintage_year: int) -> float:
+        """Total credits minted for a vintage year"""
+        return self._credits_by_vintage.get(vintage_year, 0)
+        
+    def credits_for_project(self, project_id: str) -> float:
+        """Total credits minted for a project"""
+        return self._credits_by_project.get(project_id, 0)
+        
+    def get_retirement_history(self, address: str = None, limit: Optional[int] = None) -> list:
+        """Get retirement history, newest first, optionally filtered by address"""
+        if address is None:
+            retirements = self._retirements
+        else:
+            retirements = self._retirements_by_addr.get(address, [])
+        return list(islice(reversed(retirements), limit))
         
     def get_contract_stats(self) -> dict:
         """Get enhanced contract statistics"""
         active_supply = self.total_supply - self.retired_supply
         
-        # Calculate additional metrics
-        vintage_breakdown = {}
-        standard_breakdown = {}
-        project_breakdown = {}
-        
-        for token in self.tokens.values():
-            # Vintage year breakdown
-            vintage = token.vintage_year
-            if vintage not in vintage_breakdown:
-                vintage_breakdown[vintage] = {'total': 0, 'retired': 0, 'active': 0}
-            vintage_breakdown[vintage]['total'] += token.credits_amount
-            vintage_breakdown[vintage]['retired'] += token.get_total_retired()
-            vintage_breakdown[vintage]['active'] += token.available_amount
-            
-            # Standard breakdown
-            standard = token.certification_standard
-            if standard not in standard_breakdown:
-                standard_breakdown[standard] = {'total': 0, 'retired': 0, 'active': 0}
-            standard_breakdown[standard]['total'] += token.credits_amount
-            standard_breakdown[standard]['retired'] += token.get_total_retired()
-            standard_breakdown[standard]['active'] += token.available_amount
-            
-            # Project breakdown
-            project = token.project_id
-            if project not in project_breakdown:
-                project_breakdown[project] = {'total': 0, 'retired': 0, 'active': 0}
-            project_breakdown[project]['total'] += token.credits_amount
-            project_breakdown[project]['retired'] += token.get_total_retired()
-            project_breakdown[project]['active'] += token.available_amount
+        # Copy the maintained breakdowns so callers can't alter contract state
+        vintage_breakdown = {k: dict(v) for k, v in self._vintage_breakdown.items()}
+        standard_breakdown = {k: dict(v) for k, v in self._standard_breakdown.items()}
+        project_breakdown = {k: dict(v) for k, v in self._project_breakdown.items()}
         
         return {
             'contract_address': self.contract_address,
@@ -477,12 +752,12 @@ class SmartContract:
             'retired_supply': self.retired_supply,
             'retirement_rate': (self.retired_supply / self.total_supply * 100) if self.total_supply > 0 else 0,
             'total_tokens': len(self.tokens),
-            'fully_retired_tokens': len([t for t in self.tokens.values() if t.retired]),
-            'partially_retired_tokens': len([t for t in self.tokens.values() if t.get_total_retired() > 0 and not t.retired]),
-            'active_tokens': len([t for t in self.tokens.values() if not t.retired]),
+            'fully_retired_tokens': self._fully_retired_count,
+            'partially_retired_tokens': self._partially_retired_count,
+            'active_tokens': self.active_token_count(),
             'total_transactions': len(self.transactions),
-            'unique_addresses': len(set([tx.from_address for tx in self.transactions if tx.from_address] + 
-                                      [tx.to_address for tx in self.transactions if tx.to_address])),
+            # Keys of the address index are exactly the addresses seen on any transaction
+            'unique_addresses': len(self._tx_by_addr),
             'vintage_breakdown': vintage_breakdown,
             'standard_breakdown': standard_breakdown,
             'project_breakdown': project_breakdown
@@ -503,13 +778,7 @@ class BlockchainMRV:
         
     def _sanitize_for_json(self, data):
         """Recursively sanitize data for JSON serialization (convert datetimes)"""
-        if isinstance(data, dict):
-            return {k: self._sanitize_for_json(v) for k, v in data.items()}
-        if isinstance(data, list):
-            return [self._sanitize_for_json(v) for v in data]
-        if isinstance(data, datetime):
-            return data.isoformat()
-        return data
+        return _sanitize_for_json(data)
 
     def submit_project_to_blockchain(self, project_data: dict) -> str:
         """Submit project to blockchain and create initial record"""
@@ -563,7 +832,7 @@ class BlockchainMRV:
         
         # If approved, mint tokens
         if approval_data.get('status') == 'approved' and approval_data.get('credits_approved', 0) > 0:
-            token_id = self.smart_contract.mint_tokens(
+            token_id, _ = self.smart_contract.mint_tokens(
                 project_id=project_id,
                 credits_amount=approval_data['credits_approved'],
                 metadata={
@@ -640,8 +909,7 @@ class BlockchainMRV:
         static_data = {k: v for k, v in field_data.items() 
                       if k not in ['submission_timestamp', 'blockchain_hash']}
         
-        data_string = json.dumps(static_data, sort_keys=True)
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return _sha256(_canonical_json(static_data)).hexdigest()
     
     def _hash_project_data(self, project_data: dict) -> str:
         """Create hash of project data for integrity"""
@@ -649,8 +917,7 @@ class BlockchainMRV:
         static_data = {k: v for k, v in project_data.items() 
                       if k not in ['last_updated', 'submission_date']}
         
-        data_string = json.dumps(static_data, sort_keys=True)
-        return hashlib.sha256(data_string.encode()).hexdigest()
+        return _sha256(_canonical_json(static_data)).hexdigest()
     
     def get_blockchain_stats(self) -> dict:
         """Get overall blockchain statistics"""
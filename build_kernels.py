@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time kernel build for the BlueCarbon MRV carbon calculator
+Compiles the sequestration age curve into the carbon_kernels extension module with numba.pycc,
+so servers import native code instead of paying JIT compilation on the first estimate.
+
+Usage: python build_kernels.py   (writes carbon_kernels.*.so / .pyd next to this file)
+"""
+
+import os
+import sys
+
+from numba.pycc import CC
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from carbon_impact_calculator import _age_curve_loop
+
+cc = CC('carbon_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Same signature as the JIT kernel: (base_rate, duration_years, curve_code) -> yearly rates
+cc.export('apply_age_curve', 'f8[:](f8, i8, i8)')(_age_curve_loop)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built {cc.name} in {cc.output_dir}")
@@ -1,8 +1,25 @@
+import atexit
+import hashlib
+import hmac
 import os
+import queue
+import secrets
 import sqlite3
+import threading
+import weakref
+from contextlib import closing
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# Try to import argon2-cffi for password hashing, fallback to werkzeug's hashes if not available
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+    _password_hasher = PasswordHasher()
+except ImportError:
+    ARGON2_AVAILABLE = False
+
 DB_PATH = os.path.join(os.path.dirname(__file__), 'bluecarbon.db')
 
 SCHEMA = [
@@ -82,84 +99,235 @@ SCHEMA = [
         status TEXT,
         blockchain_hash TEXT
     );
-    """
+    """,
+    # Lookup indexes: logins by (email, role), tokens by project, marketplace history by buyer
+    "CREATE INDEX IF NOT EXISTS idx_users_email_role ON users(email, role);",
+    "CREATE INDEX IF NOT EXISTS idx_tokens_project_id ON tokens(project_id);",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_buyer_id ON transactions(buyer_id);"
 ]
 
+# Per-connection settings: NORMAL sync is crash-safe under WAL, and busy_timeout waits out writer locks
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+
+# journal_mode is persisted in the database file, so WAL only needs switching on once per process
+_wal_enabled = False
+
+
+# Idle connections kept for reuse by get_conn(); extra connections beyond this are really closed
+POOL_SIZE = os.cpu_count() or 4
+
+
+class _PooledConnection(sqlite3.Connection):
+    """Connection from get_conn(); close() hands it back to the pool instead of closing it"""
+
+    def close(self):
+        if self._pooled:
+            return
+        if self.in_transaction:
+            self.rollback()
+        self.row_factory = sqlite3.Row
+        self._pooled = True
+        try:
+            _pool.put_nowait(self)
+        except queue.Full:
+            super().close()
+
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+
+
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
+    """Get a configured connection from the pool (or a new one); the caller closes it to return it"""
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        # Pooled connections move between request threads, so the same-thread check is off
+        conn = _connect(factory=_PooledConnection, check_same_thread=False)
+    conn._pooled = False
+    return conn
+
+
+def _connect(**kwargs):
+    global _wal_enabled
+    conn = sqlite3.connect(DB_PATH, cached_statements=256, **kwargs)
     conn.row_factory = sqlite3.Row
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class _ThreadConnection(sqlite3.Connection):
+    """Connection kept open for one thread's db.py calls (subclassed so it can be weakly tracked)"""
+
+
+_tls = threading.local()
+_thread_conns = weakref.WeakSet()
+
+
+def _thread_conn():
+    """This thread's long-lived connection, so repeat calls keep SQLite's page and statement caches warm"""
+    conn = getattr(_tls, 'conn', None)
+    if conn is None:
+        # Only the owning thread uses it; check_same_thread=False lets _close_all close it at exit
+        conn = _connect(factory=_ThreadConnection, check_same_thread=False)
+        _tls.conn = conn
+        _thread_conns.add(conn)
     return conn
 
 
+@atexit.register
+def _close_all():
+    for conn in list(_thread_conns):
+        conn.close()
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            break
+        sqlite3.Connection.close(conn)
+
+
 def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
-    for stmt in SCHEMA:
-        cur.executescript(stmt)
-    conn.commit()
-    # Seed default users if not exists
-    cur.execute("SELECT COUNT(*) as c FROM users")
-    if cur.fetchone()[0] == 0:
-        now = datetime.utcnow().isoformat()
-        users = [
-            ("admin@nccr.gov", generate_password_hash("Admin@123"), "admin", "NCCR Admin", "NCCR"),
-            ("ngo@example.org", generate_password_hash("Ngo@123"), "ngo", "Test NGO User", "Green Earth Foundation"),
-            ("panchayat@example.in", generate_password_hash("Panchayat@123"), "panchayat", "Coastal Panchayat", "Panchayat"),
-            ("industry@example.com", generate_password_hash("Industry@123"), "industry", "Test Industry User", "EcoTech Industries Ltd")
-        ]
-        for email, ph, role, name, org in users:
-            cur.execute(
-                "INSERT INTO users (email, password_hash, role, name, organization, created_at) VALUES (?,?,?,?,?,?)",
-                (email, ph, role, name, org, now)
-            )
-        conn.commit()
-    conn.close()
+    with closing(get_conn()) as conn:
+        cur = conn.cursor()
+        for stmt in SCHEMA:
+            cur.executescript(stmt)
+        # Seed default users if not exists
+        cur.execute("SELECT 1 FROM users LIMIT 1")
+        if cur.fetchone() is None:
+            now = datetime.utcnow().isoformat()
+            users = [
+                ("admin@nccr.gov", hash_password("Admin@123"), "admin", "NCCR Admin", "NCCR"),
+                ("ngo@example.org", hash_password("Ngo@123"), "ngo", "Test NGO User", "Green Earth Foundation"),
+                ("panchayat@example.in", hash_password("Panchayat@123"), "panchayat", "Coastal Panchayat", "Panchayat"),
+                ("industry@example.com", hash_password("Industry@123"), "industry", "Test Industry User", "EcoTech Industries Ltd")
+            ]
+            with conn:
+                cur.executemany(
+                    "INSERT INTO users (email, password_hash, role, name, organization, created_at) VALUES (?,?,?,?,?,?)",
+                    [(email, ph, role, name, org, now) for email, ph, role, name, org in users]
+                )
+
+
+def hash_password(password: str) -> str:
+    """Hash a password for the users table (argon2id when available)"""
+    if ARGON2_AVAILABLE:
+        return _password_hasher.hash(password)
+    return generate_password_hash(password)
+
+
+def _check_password(stored_hash: str, password: str) -> bool:
+    """Check a password against either an argon2 or a werkzeug (pbkdf2/scrypt) hash"""
+    if stored_hash.startswith("$argon2"):
+        if not ARGON2_AVAILABLE:
+            return False
+        try:
+            return _password_hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(stored_hash, password)
+
+
+def _needs_rehash(stored_hash: str) -> bool:
+    """Werkzeug hashes, or argon2 hashes with outdated parameters, are upgraded on next login"""
+    if not ARGON2_AVAILABLE:
+        return False
+    if not stored_hash.startswith("$argon2"):
+        return True
+    return _password_hasher.check_needs_rehash(stored_hash)
+
+
+# Login lookup, kept as one constant string for the statement cache
+_SELECT_USER_SQL = (
+    "SELECT id, email, role, name, organization, password_hash, created_at FROM users WHERE email=? AND role=?"
+)
+_UPDATE_PASSWORD_SQL = "UPDATE users SET password_hash=? WHERE id=?"
+
+
+# Password checks that already succeeded, keyed by the stored hash and an HMAC of the password under a
+# per-process random key (the password itself is never kept). The user row is still read on every login,
+# so a removed account or a changed password hash misses this cache.
+VERIFIED_PASSWORD_CACHE_MAX_SIZE = 1024
+_verified_passwords = set()  # (stored password_hash, password mac)
+_PASSWORD_MAC_KEY = secrets.token_bytes(32)
 
 
 def verify_user(email: str, password: str, role: str):
-    conn = get_conn()
+    conn = _thread_conn()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM users WHERE email=? AND role=?", (email, role))
+    cur.execute(_SELECT_USER_SQL, (email, role))
     row = cur.fetchone()
-    conn.close()
-    if row and check_password_hash(row["password_hash"], password):
-        return dict(row)
-    return None
+    if row is None:
+        return None
+    
+    stored_hash = row["password_hash"]
+    password_mac = hmac.new(_PASSWORD_MAC_KEY, password.encode(), hashlib.sha256).digest()
+    if (stored_hash, password_mac) not in _verified_passwords:
+        if not _check_password(stored_hash, password):
+            return None
+        if _needs_rehash(stored_hash):
+            stored_hash = hash_password(password)
+            with conn:
+                conn.execute(_UPDATE_PASSWORD_SQL, (stored_hash, row["id"]))
+        if len(_verified_passwords) >= VERIFIED_PASSWORD_CACHE_MAX_SIZE:
+            _verified_passwords.clear()
+        _verified_passwords.add((stored_hash, password_mac))
+    
+    user = dict(row)
+    del user["password_hash"]
+    return user
+
+
+# Column order for token rows; token dicts use the same keys
+_TOKEN_COLS = (
+    "token_id", "project_id", "project_name", "creator_ngo", "ecosystem_type", "credit_amount",
+    "vintage_year", "status", "current_owner", "mint_date", "retired_by", "retirement_date"
+)
+
+# Column order for transaction rows, and the transaction dict key feeding each column
+_TRANSACTION_COLS = (
+    "tx_id", "token_id", "project_id", "project_name", "seller_id", "buyer_id", "buyer_name",
+    "credits_sold", "price_per_credit", "total_value", "timestamp", "status", "blockchain_hash"
+)
+_TRANSACTION_KEYS = ("id",) + _TRANSACTION_COLS[1:]
+
+# Fixed SQL strings, so each thread connection compiles them once and reuses them from its statement cache
+_INSERT_TOKEN_SQL = (
+    f"INSERT OR REPLACE INTO tokens ({', '.join(_TOKEN_COLS)}) VALUES ({','.join('?' * len(_TOKEN_COLS))})"
+)
+_INSERT_TX_SQL = (
+    f"INSERT OR REPLACE INTO transactions ({', '.join(_TRANSACTION_COLS)}) "
+    f"VALUES ({','.join('?' * len(_TRANSACTION_COLS))})"
+)
 
 
 def save_token(token: dict):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT OR REPLACE INTO tokens
-        (token_id, project_id, project_name, creator_ngo, ecosystem_type, credit_amount, vintage_year, status, current_owner, mint_date, retired_by, retirement_date)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            token.get("token_id"), token.get("project_id"), token.get("project_name"), token.get("creator_ngo"),
-            token.get("ecosystem_type"), token.get("credit_amount"), token.get("vintage_year"), token.get("status"),
-            token.get("current_owner"), token.get("mint_date"), token.get("retired_by"), token.get("retirement_date")
-        )
-    )
-    conn.commit()
-    conn.close()
+    save_tokens_bulk([token])
+
+
+def save_tokens_bulk(tokens: list):
+    """Insert or replace many tokens in one transaction"""
+    rows = [tuple(token.get(col) for col in _TOKEN_COLS) for token in tokens]
+    conn = _thread_conn()
+    with conn:
+        conn.executemany(_INSERT_TOKEN_SQL, rows)
 
 
 def save_transaction(tx: dict):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT OR REPLACE INTO transactions
-        (tx_id, token_id, project_id, project_name, seller_id, buyer_id, buyer_name, credits_sold, price_per_credit, total_value, timestamp, status, blockchain_hash)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            tx.get("id"), tx.get("token_id"), tx.get("project_id"), tx.get("project_name"), tx.get("seller_id"), tx.get("buyer_id"),
-            tx.get("buyer_name"), tx.get("credits_sold"), tx.get("price_per_credit"), tx.get("total_value"),
-            tx.get("timestamp"), tx.get("status"), tx.get("blockchain_hash")
-        )
-    )
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    save_transactions_bulk([tx])
+
+
+def save_transactions_bulk(txs: list):
+    """Insert or replace many marketplace transactions in one transaction"""
+    rows = [tuple(tx.get(key) for key in _TRANSACTION_KEYS) for tx in txs]
+    conn = _thread_conn()
+    with conn:
+        conn.executemany(_INSERT_TX_SQL, rows)
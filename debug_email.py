@@ -15,63 +15,25 @@ from datetime import datetime
 
 load_dotenv()
 
-def test_email_with_different_senders():
-    """Test email with different sender configurations"""
-    
-    smtp_host = 'smtp-relay.brevo.com'
-    smtp_port = 587
-    username = '97c0ad001@smtp-brevo.com'
-    password = 'TQ9EVHvPY5IMhsLF'
-    
-    # Test different sender configurations
-    sender_configs = [
-        {
-            'from_email': username,
-            'from_name': 'BlueCarbon MRV',
-            'reply_to': username
-        },
-        {
-            'from_email': username,  
-            'from_name': 'BlueCarbon Platform',
-            'reply_to': 'noreply@bluecarbon.com'
-        }
-    ]
-    
-    recipient = 'ubhadsatishm@gmail.com'
-    
-    for i, config in enumerate(sender_configs, 1):
-        print(f"\n🧪 Testing Configuration {i}:")
-        print(f"From: {config['from_name']} <{config['from_email']}>")
-        print(f"Reply-To: {config['reply_to']}")
-        
-        try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{config['from_name']} <{config['from_email']}>"
-            msg['To'] = recipient
-            msg['Reply-To'] = config['reply_to']
-            msg['Subject'] = f"🌊 BlueCarbon MRV Test #{i} - {datetime.now().strftime('%H:%M:%S')}"
-            
-            # Plain text version
-            text_content = f"""
+# Test message bodies, filled per configuration with str.format
+TEST_TEXT_TEMPLATE = """
 Hello!
 
 This is test email #{i} from BlueCarbon MRV Platform.
 
 Configuration Details:
-- Sender: {config['from_name']} <{config['from_email']}>
-- Reply-To: {config['reply_to']}
-- Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-- Test ID: TEST-{i}-{datetime.now().strftime('%H%M%S')}
+- Sender: {from_name} <{from_email}>
+- Reply-To: {reply_to}
+- Time: {sent_at}
+- Test ID: TEST-{i}-{test_stamp}
 
 If you receive this email, the configuration is working!
 
 Best regards,
 BlueCarbon MRV Team
             """
-            
-            # HTML version
-            html_content = f"""
+
+TEST_HTML_TEMPLATE = """
             <!DOCTYPE html>
             <html>
             <head>
@@ -87,10 +49,10 @@ BlueCarbon MRV Team
                     
                     <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
                         <h3 style="margin-top: 0; color: #333;">✅ Email Delivery Test</h3>
-                        <p><strong>Configuration:</strong> {config['from_name']} &lt;{config['from_email']}&gt;</p>
-                        <p><strong>Reply-To:</strong> {config['reply_to']}</p>
-                        <p><strong>Time:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                        <p><strong>Test ID:</strong> TEST-{i}-{datetime.now().strftime('%H%M%S')}</p>
+                        <p><strong>Configuration:</strong> {from_name} &lt;{from_email}&gt;</p>
+                        <p><strong>Reply-To:</strong> {reply_to}</p>
+                        <p><strong>Time:</strong> {sent_at}</p>
+                        <p><strong>Test ID:</strong> TEST-{i}-{test_stamp}</p>
                     </div>
                     
                     <div style="background: #e3f2fd; padding: 20px; border-radius: 8px; margin: 20px 0;">
@@ -109,25 +71,81 @@ BlueCarbon MRV Team
             </body>
             </html>
             """
+
+def test_email_with_different_senders():
+    """Test email with different sender configurations"""
+    
+    smtp_host = 'smtp-relay.brevo.com'
+    smtp_port = 587
+    username = '97c0ad001@smtp-brevo.com'
+    password = 'TQ9EVHvPY5IMhsLF'
+    
+    # Test different sender configurations
+    sender_configs = [
+        {
+            'from_email': username,
+            'from_name': 'BlueCarbon MRV',
+            'reply_to': username
+        },
+        {
+            'from_email': username,  
+            'from_name': 'BlueCarbon Platform',
+            'reply_to': 'noreply@bluecarbon.com'
+        }
+    ]
+    
+    recipient = 'ubhadsatishm@gmail.com'
+    
+    try:
+        # One session for every configuration, so TLS and AUTH happen once
+        with smtplib.SMTP(smtp_host, smtp_port) as server:
+            server.starttls()
+            server.login(username, password)
+            
+            for i, config in enumerate(sender_configs, 1):
+                print(f"\n🧪 Testing Configuration {i}:")
+                print(f"From: {config['from_name']} <{config['from_email']}>")
+                print(f"Reply-To: {config['reply_to']}")
+        
+                try:
+                    # Create message
+                    msg = MIMEMultipart('alternative')
+                    msg['From'] = f"{config['from_name']} <{config['from_email']}>"
+                    msg['To'] = recipient
+                    msg['Reply-To'] = config['reply_to']
+                    now = datetime.now()
+                    msg['Subject'] = f"🌊 BlueCarbon MRV Test #{i} - {now.strftime('%H:%M:%S')}"
+            
+                    # Timestamps formatted once per message and shared by both versions
+                    fields = {
+                        'i': i,
+                        'from_name': config['from_name'],
+                        'from_email': config['from_email'],
+                        'reply_to': config['reply_to'],
+                        'sent_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+                        'test_stamp': now.strftime('%H%M%S'),
+                    }
+                    text_content = TEST_TEXT_TEMPLATE.format(**fields)
+                    html_content = TEST_HTML_TEMPLATE.format(**fields)
             
-            # Attach both versions
-            text_part = MIMEText(text_content, 'plain', 'utf-8')
-            html_part = MIMEText(html_content, 'html', 'utf-8')
+                    # Attach both versions
+                    text_part = MIMEText(text_content, 'plain', 'utf-8')
+                    html_part = MIMEText(html_content, 'html', 'utf-8')
             
-            msg.attach(text_part)
-            msg.attach(html_part)
+                    msg.attach(text_part)
+                    msg.attach(html_part)
             
-            # Send email
-            with smtplib.SMTP(smtp_host, smtp_port) as server:
-                server.starttls()
-                server.login(username, password)
-                result = server.send_message(msg)
-                
-            print(f"✅ Test #{i} sent successfully!")
-            print(f"📨 Check your inbox: {recipient}")
+                    # Send email
+                    result = server.send_message(msg)
             
-        except Exception as e:
-            print(f"❌ Test #{i} failed: {str(e)}")
+                    print(f"✅ Test #{i} sent successfully!")
+                    print(f"📨 Check your inbox: {recipient}")
+            
+                except Exception as e:
+                    print(f"❌ Test #{i} failed: {str(e)}")
+    except Exception as e:
+        print(f"❌ SMTP session failed: {str(e)}")
+        return False
     
     return True
 
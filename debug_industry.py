@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 from db import get_conn
-from app import generate_comprehensive_admin_data, admin_industries_data
+from app import generate_comprehensive_admin_data, admin_industries_data, admin_industries_by_email
 
 print("=== Industry Authentication Debug ===")
 
@@ -25,7 +25,7 @@ for i, ind in enumerate(admin_industries_data[:3]):
 
 print("\n3. Looking for test account match:")
 test_email = "industry@example.com"
-match = next((ind for ind in admin_industries_data if ind['email'] == test_email), None)
+match = admin_industries_by_email.get(test_email)
 if match:
     print(f"   ✅ Found match for {test_email}: {match['name']} (status: {match['status']})")
 else:
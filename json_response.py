@@ -0,0 +1,36 @@
+"""
+Fast JSON Response Helper for BlueCarbon MRV System
+Serializes API payloads with orjson when available, falling back to the stdlib encoder
+"""
+
+import json
+from datetime import date, datetime
+
+from flask import current_app
+
+# Try to import orjson, fallback to stdlib json if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(obj):
+    """Serializer for objects the stdlib encoder does not handle"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(payload) -> bytes:
+    """Serialize payload to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=_json_default, option=ORJSON_OPTIONS)
+    return json.dumps(payload, default=_json_default, separators=(',', ':')).encode()
+
+
+def ojson(payload, status: int = 200):
+    """Build a JSON response, a faster drop-in for flask.jsonify"""
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
@@ -175,7 +175,7 @@ def mint_carbon_credits(project_id):
             blockchain_type = 'Real Blockchain (Hardhat)'
         else:
             # Use simulation
-            token_id = blockchain_mrv.smart_contract.mint_tokens(
+            token_id, _ = blockchain_mrv.smart_contract.mint_tokens(
                 project_id=project_id,
                 credits_amount=amount,
                 metadata={
@@ -412,7 +412,7 @@ def run_demo_workflow():
                 else:
                     # Use simulation minting
                     try:
-                        token_id = blockchain_mrv.smart_contract.mint_tokens(
+                        token_id, _ = blockchain_mrv.smart_contract.mint_tokens(
                             project_id=f"demo_{record_id}",
                             credits_amount=credits_amount,
                             metadata={'project_name': project_name}
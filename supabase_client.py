@@ -5,6 +5,9 @@ Provides database operations and real-time capabilities
 
 import os
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
@@ -51,6 +54,9 @@ class SupabaseClient:
                 logger.warning(f"Failed to initialize Supabase client: {e}, using mock mode")
                 self.client = None
                 self.mock_mode = True
+        
+        # Worker pool for fanning out independent writes in bulk operations
+        self._write_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='supabase-write')
     
     # User Management
     async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -192,10 +198,11 @@ class SupabaseClient:
             logger.error(f"Error creating token: {e}")
             return None
     
-    def get_tokens(self, filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Get tokens with optional filters"""
+    def get_tokens(self, filters: Dict[str, Any] = None, limit: Optional[int] = None,
+                   offset: int = 0) -> List[Dict[str, Any]]:
+        """Get tokens with optional filters and pagination"""
         if self.mock_mode:
-            return [
+            tokens = [
                 {
                     'id': 'TOKEN001',
                     'project_id': 'PROJ1001',
@@ -206,6 +213,9 @@ class SupabaseClient:
                     'created_at': datetime.now().isoformat()
                 }
             ]
+            if limit is None:
+                return tokens[offset:]
+            return tokens[offset:offset + limit]
         
         try:
             query = self.client.table('tokens').select('*')
@@ -214,12 +224,41 @@ class SupabaseClient:
                 for key, value in filters.items():
                     query = query.eq(key, value)
             
+            if limit is not None:
+                query = query.range(offset, offset + limit - 1)
+            elif offset:
+                query = query.offset(offset)
+            
             result = query.execute()
             return result.data
         except Exception as e:
             logger.error(f"Error getting tokens: {e}")
             return []
     
+    def get_tokens_by_ids(self, token_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get token records for many token IDs in one query"""
+        if self.mock_mode:
+            return [token for token in self.get_tokens() if token['token_id'] in token_ids]
+        
+        try:
+            result = self.client.table('tokens').select('*').in_('token_id', token_ids).execute()
+            return result.data
+        except Exception as e:
+            logger.error(f"Error getting tokens by ids: {e}")
+            return []
+    
+    def get_wallet_balance(self, address: str) -> Optional[Dict[str, Any]]:
+        """Get a wallet's active balance, aggregated server-side by the wallet_balance RPC"""
+        if self.mock_mode:
+            return None
+        
+        try:
+            result = self.client.rpc('wallet_balance', {'addr': address}).execute()
+            return result.data
+        except Exception as e:
+            logger.error(f"Error getting wallet balance: {e}")
+            return None
+    
     def transfer_token(self, token_id: str, from_address: str, to_address: str, amount: float) -> bool:
         """Record token transfer"""
         if self.mock_mode:
@@ -279,6 +318,36 @@ class SupabaseClient:
             logger.error(f"Error retiring token: {e}")
             return False
     
+    def _run_per_token(self, entries: List[Dict[str, Any]], write) -> List[bool]:
+        """Apply write to each entry, in order within a token and concurrently across tokens"""
+        groups: Dict[str, List[int]] = {}
+        for i, entry in enumerate(entries):
+            groups.setdefault(entry['token_id'], []).append(i)
+        
+        def run_group(indexes: List[int]) -> List[bool]:
+            # A later entry may build on an earlier one for the same token (A->B then B->C)
+            return [write(entries[i]) for i in indexes]
+        
+        results = [False] * len(entries)
+        for indexes, group_results in zip(groups.values(), self._write_pool.map(run_group, groups.values())):
+            for i, ok in zip(indexes, group_results):
+                results[i] = ok
+        return results
+    
+    def transfer_tokens_bulk(self, transfers: List[Dict[str, Any]]) -> List[bool]:
+        """Record many token transfers, one result per transfer in input order"""
+        return self._run_per_token(
+            transfers,
+            lambda t: self.transfer_token(t['token_id'], t['from_address'], t['to_address'], t['amount'])
+        )
+    
+    def retire_tokens_bulk(self, retirements: List[Dict[str, Any]]) -> List[bool]:
+        """Mark many tokens as retired, one result per retirement in input order"""
+        return self._run_per_token(
+            retirements,
+            lambda r: self.retire_token(r['token_id'], r['owner_address'], r['reason'])
+        )
+    
     # Transaction Management
     def create_transaction(self, transaction_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a transaction record"""
@@ -382,8 +451,87 @@ class SupabaseClient:
             return None
 
 
+class TokenBatchLoader:
+    """Coalesce concurrent single-token lookups into one batched query
+    
+    Requests arriving within batch_window seconds share a single
+    get_tokens_by_ids round-trip; results are kept for cache_ttl seconds.
+    """
+    
+    def __init__(self, client: SupabaseClient, batch_window: float = 0.01,
+                 max_batch_size: int = 200, cache_ttl: float = 2.0, max_cache_size: int = 4096):
+        self.client = client
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.cache_ttl = cache_ttl
+        self.max_cache_size = max_cache_size
+        self._lock = threading.Lock()
+        self._pending = {}  # token_id -> [Future, ...]
+        self._timer = None
+        self._cache = {}  # token_id -> (expires_at, record)
+    
+    def load(self, token_id: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """Get the database record for a token, batching with concurrent callers"""
+        with self._lock:
+            cached = self._cache.get(token_id)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            
+            future = Future()
+            self._pending.setdefault(token_id, []).append(future)
+            
+            batch = None
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.batch_window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        if batch:
+            self._dispatch(batch)
+        
+        return future.result(timeout=timeout)
+    
+    def _take_pending(self) -> Dict[str, List[Future]]:
+        """Detach the pending batch; caller must hold the lock"""
+        batch, self._pending = self._pending, {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _flush(self):
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: Dict[str, List[Future]]):
+        try:
+            records = self.client.get_tokens_by_ids(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(e)
+            return
+        
+        records_by_id = {record['token_id']: record for record in records}
+        expires_at = time.monotonic() + self.cache_ttl
+        with self._lock:
+            if len(self._cache) >= self.max_cache_size:
+                self._cache.clear()
+            for token_id in batch:
+                self._cache[token_id] = (expires_at, records_by_id.get(token_id))
+        
+        for token_id, futures in batch.items():
+            for future in futures:
+                future.set_result(records_by_id.get(token_id))
+
+
 # Global instance
 supabase_client = SupabaseClient()
+token_loader = TokenBatchLoader(supabase_client)
 
 # Database schema creation functions (for initial setup)
 def create_database_schema():
@@ -480,6 +628,23 @@ def create_database_schema():
     CREATE INDEX IF NOT EXISTS idx_tokens_owner ON tokens(owner_address);
     CREATE INDEX IF NOT EXISTS idx_transactions_buyer ON transactions(buyer_id);
     CREATE INDEX IF NOT EXISTS idx_transactions_project ON transactions(project_id);
+
+    -- Wallet balance aggregation (called via RPC)
+    CREATE OR REPLACE FUNCTION wallet_balance(addr TEXT)
+    RETURNS JSON AS $$
+        SELECT json_build_object(
+            'total_balance', COALESCE(SUM(credits_amount), 0),
+            'tokens_count', COUNT(*),
+            'active_tokens', COALESCE(json_agg(json_build_object(
+                'token_id', token_id,
+                'project_id', project_id,
+                'credits_amount', credits_amount,
+                'mint_date', created_at
+            ) ORDER BY created_at), '[]'::json)
+        )
+        FROM tokens
+        WHERE owner_address = addr AND status <> 'retired';
+    $$ LANGUAGE sql STABLE;
     """
     
     logger.info("Database schema SQL generated. Execute this in Supabase SQL editor.")
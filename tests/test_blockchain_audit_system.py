@@ -0,0 +1,127 @@
+import asyncio
+
+from blockchain_audit_system import (
+    BlockchainAuditSystem, TransactionStatus, TransactionType, verify_audit_trails,
+)
+
+
+async def _skip_broadcast(transaction):
+    """Stand-in for the simulated network delay (13s per transaction)"""
+
+
+async def _system_with_trails(count):
+    system = BlockchainAuditSystem()
+    system.broadcast_transaction = _skip_broadcast
+    trails = [
+        await system.create_audit_trail(
+            entity_id=f"PROJ{i % 2}",
+            entity_type="project",
+            action_performed="update",
+            actor_address="0xabc",
+            actor_role="ngo",
+            data_after={"value": i},
+        )
+        for i in range(count)
+    ]
+    return system, trails
+
+
+def test_verify_audit_trails_flags_edited_payloads():
+    _, trails = asyncio.run(_system_with_trails(3))
+    assert verify_audit_trails(trails) == ([], 3)
+
+    trails[1].data_after = {"value": "edited"}
+    assert verify_audit_trails(trails) == ([trails[1].trail_id], 3)
+
+
+def test_verify_chain_integrity_report_shape():
+    async def run():
+        system, _ = await _system_with_trails(3)
+        return await system.verify_chain_integrity()
+
+    report = asyncio.run(run())
+    assert set(report) == {
+        "total_transactions", "total_audit_trails", "verified_signatures", "failed_verifications",
+        "tampered_records", "overall_integrity", "last_verification",
+    }
+    assert report["total_audit_trails"] == 3
+
+
+def test_check_ipfs_backups_bounds_concurrency_and_stops_at_first_hit():
+    async def run():
+        system, trails = await _system_with_trails(10)
+        system.ipfs_check_concurrency = 2
+        trails[-1].ipfs_hash = None
+        in_flight = peak = calls = 0
+
+        async def has_content(ipfs_hash):
+            nonlocal in_flight, peak, calls
+            calls += 1
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.001)
+            finally:
+                in_flight -= 1
+            return ipfs_hash == trails[5].ipfs_hash
+
+        system.ipfs.has_content = has_content
+        found = await system.check_ipfs_backups(trails)
+        await asyncio.sleep(0.01)
+        missing = await system.check_ipfs_backups(trails[6:])
+        return found, missing, peak, calls
+
+    found, missing, peak, calls = asyncio.run(run())
+    assert found is True
+    assert missing is False
+    assert peak == 2
+    assert calls < 9 + 3
+
+
+def test_compliance_report_reflects_ipfs_availability():
+    async def run():
+        system, trails = await _system_with_trails(1)
+        entity_id = trails[0].entity_id
+        present = (await system.generate_compliance_report(entity_id))["verification_status"]
+        system.ipfs.storage.clear()
+        system.compliance_report_cache.clear()
+        gone = (await system.generate_compliance_report(entity_id))["verification_status"]
+        return present["ipfs_backup_available"], gone["ipfs_backup_available"]
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_cached_compliance_report_is_a_fresh_copy():
+    async def run():
+        system, _ = await _system_with_trails(2)
+        first = await system.generate_compliance_report("PROJ0")
+        first["risk_indicators"].append("EDITED")
+        first["verification_status"]["witness_signatures"] = -1
+        first["audit_timeline"][0]["action"] = "EDITED"
+
+        system._report_timestamp = lambda: "2099-01-01T00:00:00"
+        second = await system.generate_compliance_report("PROJ0")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert "EDITED" not in second["risk_indicators"]
+    assert second["verification_status"]["witness_signatures"] == 0
+    assert second["audit_timeline"][0]["action"] == "update"
+    assert second["generated_at"] == "2099-01-01T00:00:00"
+    assert first["generated_at"] != second["generated_at"]
+
+
+def test_compliance_report_cache_sees_transaction_status_changes():
+    async def run():
+        system, _ = await _system_with_trails(1)
+        transaction = await system.create_transaction(
+            TransactionType.CARBON_CREDIT_ISSUANCE, "0xabc", {"entity_id": "PROJ0"}
+        )
+        before = await system.generate_compliance_report("PROJ0")
+        system._set_transaction_status(transaction, TransactionStatus.FAILED)
+        after = await system.generate_compliance_report("PROJ0")
+        return before["risk_indicators"], after["risk_indicators"]
+
+    before, after = asyncio.run(run())
+    assert "FAILED_TRANSACTIONS" not in before
+    assert "FAILED_TRANSACTIONS" in after
@@ -0,0 +1,90 @@
+from datetime import datetime
+
+from blockchain_sim import _canonical_json
+
+
+def test_canonical_json_is_compact_sorted_stdlib_output():
+    data = {'b': 1e-7, 'a': float('nan'), 'c': 2 ** 70, 'd': 'é', 'e': datetime(2024, 1, 2)}
+    assert _canonical_json(data) == (
+        '{"a":NaN,"b":1e-07,"c":1180591620717411303424,"d":"é","e":"2024-01-02T00:00:00"}'.encode()
+    )
+
+
+def test_failed_transfers_and_retirements_do_not_grow_address_table():
+    from blockchain_sim import SmartContract
+
+    contract = SmartContract('0xcontract')
+    token_id, _ = contract.mint_tokens('PRJ-1', 10.0, {})
+    owner = contract.tokens[token_id].owner_address
+    baseline = len(contract._address_intern)
+
+    for i in range(500):
+        assert contract.transfer_tokens(token_id, f'nobody-{i}', f'dest-{i}', 1.0) is None
+        assert contract.retire_tokens(token_id, f'ghost-{i}', 1.0) is None
+    assert len(contract._address_intern) == baseline
+
+    assert contract.transfer_tokens(token_id, owner, 'buyer', 4.0)
+    assert 'buyer' in contract._address_intern
+    assert len(contract._address_intern) == baseline + 1
+
+
+def test_transactions_for_combines_filters():
+    from blockchain_sim import SmartContract
+
+    contract = SmartContract('0xcontract')
+    token_a, _ = contract.mint_tokens('PRJ-A', 10.0, {})
+    token_b, _ = contract.mint_tokens('PRJ-B', 10.0, {})
+    owner_a = contract.tokens[token_a].owner_address
+    owner_b = contract.tokens[token_b].owner_address
+    contract.transfer_tokens(token_a, owner_a, 'buyer', 2.0)
+    contract.transfer_tokens(token_b, owner_b, 'buyer', 3.0)
+    contract.retire_tokens(token_a, 'buyer', 1.0)
+
+    assert len(list(contract.transactions_for())) == 5
+    assert len(list(contract.transactions_for(token_id=token_a))) == 3
+    assert len(list(contract.transactions_for(address='buyer'))) == 3
+    assert [tx.data['token_id'] for tx in contract.transactions_for(address='buyer', tx_type='credit_transfer')] == [
+        token_a, token_b
+    ]
+    assert contract.transaction_type_counts() == {'credit_mint': 2, 'credit_transfer': 2, 'credit_retire': 1}
+
+
+def test_credit_totals_by_vintage_and_project():
+    from blockchain_sim import SmartContract
+
+    contract = SmartContract('0xcontract')
+    contract.mint_tokens('PRJ-A', 10.0, {'vintage_year': 2023})
+    contract.mint_tokens('PRJ-A', 5.0, {'vintage_year': 2024})
+    contract.mint_tokens('PRJ-B', 2.5, {'vintage_year': 2024})
+
+    assert contract.credits_for_vintage(2024) == 7.5
+    assert contract.credits_for_project('PRJ-A') == 15.0
+    assert contract.credits_for_vintage(1999) == 0
+    assert contract.credits_for_project('missing') == 0
+    assert 1999 not in contract._credits_by_vintage
+
+
+def test_active_token_count_tracks_full_retirements():
+    from blockchain_sim import SmartContract
+
+    contract = SmartContract('0xcontract')
+    token_a, _ = contract.mint_tokens('PRJ-A', 10.0, {})
+    token_b, _ = contract.mint_tokens('PRJ-B', 10.0, {})
+    contract.retire_tokens(token_a, contract.tokens[token_a].owner_address, 4.0)
+    assert contract.active_token_count() == 2
+
+    contract.retire_tokens(token_b, contract.tokens[token_b].owner_address)
+    assert contract.active_token_count() == 1
+    assert contract.active_token_count() == sum(not t.retired for t in contract.tokens.values())
+
+
+def test_transaction_to_dict_returns_independent_copies():
+    from blockchain_sim import BlockchainTransaction
+
+    tx = BlockchainTransaction('credit_mint', {'token_id': 'T1'})
+    first = tx.to_dict()
+    first['annotated'] = True
+    first['type'] = 'edited'
+
+    assert tx.to_dict()['type'] == 'credit_mint'
+    assert 'annotated' not in tx.to_dict()
@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+from carbon_impact_calculator import (
+    CarbonCalculatorInterface,
+    CarbonCredit,
+    CarbonImpactCalculator,
+    MarketPricingEngine,
+    ProjectParameters,
+    ProjectType,
+)
+
+PROJECT = {
+    'project_type': 'mangrove_restoration',
+    'area_hectares': 100,
+    'duration_years': 20,
+    'latitude': 10.0,
+    'longitude': 80.0,
+    'climate_zone': 'tropical',
+    'soil_type': 'clay',
+    'credit_standard': 'verra_vcs',
+}
+
+
+def test_detailed_analysis_results_do_not_share_table_entries():
+    first = CarbonCalculatorInterface().detailed_analysis(PROJECT)['calculation_result']
+    first['environmental_benefits']['sdg_contributions'][0]['goal'] = 'HACKED'
+    first['verification_requirements'].append('HACKED')
+
+    second = CarbonCalculatorInterface().detailed_analysis(PROJECT)['calculation_result']
+    assert second['environmental_benefits']['sdg_contributions'][0]['goal'] == 13
+    assert 'HACKED' not in second['verification_requirements']
+
+
+def test_quick_estimate_many_results_do_not_share_table_entries():
+    interface = CarbonCalculatorInterface()
+    first = interface.quick_estimate_many(['mangrove_restoration'], [100.0], [20])[0]
+    first['environmental_benefits']['sdg_contributions'][0]['goal'] = 'HACKED'
+
+    second = interface.quick_estimate_many(['mangrove_restoration'], [100.0], [20])[0]
+    assert second['environmental_benefits']['sdg_contributions'][0]['goal'] == 13
+
+
+def test_price_distribution_is_reproducible_for_a_seed():
+    engine = MarketPricingEngine()
+    first = engine.price_distribution(CarbonCredit.VCS, n_samples=5000, seed=42)
+    assert first == MarketPricingEngine().price_distribution(CarbonCredit.VCS, n_samples=5000, seed=42)
+    assert first['p5'] <= first['p50'] <= first['p95']
+    assert first['samples'] == 5000
+
+
+def test_price_distribution_rejects_empty_sample():
+    with pytest.raises(ValueError):
+        MarketPricingEngine().price_distribution(n_samples=0)
+
+
+def test_project_parameters_output_omits_internal_codes():
+    interface = CarbonCalculatorInterface()
+    expected = {
+        'project_type', 'area_hectares', 'duration_years', 'location', 'latitude', 'longitude',
+        'climate_zone', 'soil_type', 'existing_carbon_stock', 'baseline_emissions',
+    }
+    assert set(interface.detailed_analysis(PROJECT)['project_parameters']) == expected
+    assert set(json.loads(interface.detailed_analysis_json(PROJECT))['project_parameters']) == expected
+
+
+def _batch_cases():
+    types = list(ProjectType)
+    climates = ['tropical', 'subtropical', 'temperate', 'boreal', 'arid', 'semi_arid', 'unknown']
+    soils = ['organic_rich', 'clay', 'loam', 'sandy', 'rocky', 'waterlogged', 'unknown']
+    coordinates = [(10.0, 80.0), (-33.9, 18.4), (51.5, -0.1), (-23.5, -46.6), (95.0, 0.0)]
+    return [
+        ProjectParameters(
+            project_type=types[i % len(types)],
+            area_hectares=5.0 + 13.7 * i,
+            duration_years=1 + (i * 7) % 70,
+            location='test',
+            latitude=coordinates[i % len(coordinates)][0],
+            longitude=coordinates[i % len(coordinates)][1],
+            climate_zone=climates[i % len(climates)],
+            soil_type=soils[(i * 3) % len(soils)],
+            existing_carbon_stock=100.0 if i % 4 == 0 else None,
+        )
+        for i in range(60)
+    ]
+
+
+def test_calculate_project_impact_batch_matches_scalar_path():
+    calculator = CarbonImpactCalculator()
+    cases = _batch_cases()
+    batch = calculator.calculate_project_impact_batch({
+        'project_type': [p.project_type for p in cases],
+        'area_hectares': [p.area_hectares for p in cases],
+        'duration_years': [p.duration_years for p in cases],
+        'latitude': [p.latitude for p in cases],
+        'longitude': [p.longitude for p in cases],
+        'climate_zone': [p.climate_zone for p in cases],
+        'soil_type': [p.soil_type for p in cases],
+        'existing_carbon_stock': [p.existing_carbon_stock for p in cases],
+    })
+
+    for i, parameters in enumerate(cases):
+        # Revenue is left out: prices carry random market volatility on both paths
+        result = calculator.calculate_project_impact(parameters)
+        assert batch['total_co2_sequestered'][i] == pytest.approx(result.total_co2_sequestered)
+        assert batch['annual_sequestration_rate'][i] == pytest.approx(result.annual_sequestration_rate)
+        assert batch['carbon_credits_generated'][i] == pytest.approx(result.carbon_credits_generated)
+        assert batch['confidence_level'][i] == pytest.approx(result.confidence_level)
+        assert batch['region'][i] == calculator._determine_region(parameters.latitude, parameters.longitude)
+
+        benefits = result.environmental_benefits
+        scalar_benefits = {
+            **benefits['biodiversity'], **benefits['water_impact'], **benefits['soil_health'],
+            'total_economic_value': benefits['total_economic_value'],
+        }
+        for key, value in scalar_benefits.items():
+            assert batch['environmental_benefits'][key][i] == pytest.approx(value), key
+
+
+def test_quick_estimate_many_matches_quick_estimate():
+    interface = CarbonCalculatorInterface()
+    types = ['mangrove_restoration', 'Blue Carbon', 'reforestation', 'nonsense']
+    areas = [10.0, 250.0, 3.5, 40.0]
+    durations = [5, 30, 60, 12]
+    climates = ['Tropical', 'arid', 'boreal', 'temperate']
+    soils = ['clay', 'Sandy', 'loam', 'waterlogged']
+
+    many = interface.quick_estimate_many(types, areas, durations, climates, soils)
+    for row, args in zip(many, zip(types, areas, durations)):
+        i = types.index(args[0])
+        single = interface.quick_estimate(*args, climate=climates[i], soil=soils[i])
+        for key in ('total_co2_sequestered', 'carbon_credits', 'annual_rate'):
+            assert row['summary'][key] == pytest.approx(single['summary'][key]), key
+        assert row['confidence_level'] == pytest.approx(single['confidence_level'])
+        assert row['methodology'] == single['methodology']
+
+
+@pytest.mark.parametrize('duration', [0, -5])
+def test_non_positive_duration_is_rejected(duration):
+    with pytest.raises(ValueError, match='duration_years'):
+        CarbonCalculatorInterface().quick_estimate('mangrove_restoration', 100, duration)
+    with pytest.raises(ValueError, match='duration_years'):
+        CarbonCalculatorInterface().quick_estimate_many(['mangrove_restoration'] * 2, [100, 100], [20, duration])
+
+    # The rejected call must not leave a NaN estimate behind for later calls
+    summary = CarbonCalculatorInterface().quick_estimate('mangrove_restoration', 100, 1)['summary']
+    assert summary['annual_rate'] == summary['annual_rate']
@@ -0,0 +1,142 @@
+import queue
+import threading
+
+import pytest
+
+import db
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point db.py at a fresh database with no connections carried over from other tests"""
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    monkeypatch.setattr(db, '_wal_enabled', False)
+    monkeypatch.setattr(db, '_tls', threading.local())
+    monkeypatch.setattr(db, '_pool', queue.LifoQueue(maxsize=db.POOL_SIZE))
+    db.init_db()
+    yield db
+    db._close_all()
+
+
+def _set_password(email, password):
+    conn = db.get_conn()
+    with conn:
+        conn.execute("UPDATE users SET password_hash=? WHERE email=?", (db.hash_password(password), email))
+    conn.close()
+
+
+def test_verify_user_omits_password_hash(temp_db):
+    user = db.verify_user("admin@nccr.gov", "Admin@123", "admin")
+    assert user['email'] == "admin@nccr.gov"
+    assert 'password_hash' not in user
+    assert db.verify_user("admin@nccr.gov", "wrong", "admin") is None
+    assert db.verify_user("admin@nccr.gov", "Admin@123", "ngo") is None
+
+
+def test_verify_user_sees_password_change_immediately(temp_db):
+    assert db.verify_user("ngo@example.org", "Ngo@123", "ngo")
+    _set_password("ngo@example.org", "Changed@123")
+    assert db.verify_user("ngo@example.org", "Ngo@123", "ngo") is None
+    assert db.verify_user("ngo@example.org", "Changed@123", "ngo")
+
+
+def test_verify_user_sees_account_removal_immediately(temp_db):
+    assert db.verify_user("admin@nccr.gov", "Admin@123", "admin")
+    conn = db.get_conn()
+    with conn:
+        conn.execute("DELETE FROM users WHERE email='admin@nccr.gov'")
+    conn.close()
+    assert db.verify_user("admin@nccr.gov", "Admin@123", "admin") is None
+
+
+def test_verify_user_upgrades_werkzeug_hashes(temp_db):
+    pytest.importorskip('argon2')
+    from werkzeug.security import generate_password_hash
+
+    conn = db.get_conn()
+    with conn:
+        conn.execute("UPDATE users SET password_hash=? WHERE email='ngo@example.org'",
+                     (generate_password_hash("Ngo@123"),))
+    conn.close()
+
+    assert db.verify_user("ngo@example.org", "Ngo@123", "ngo")
+    conn = db.get_conn()
+    stored = conn.execute("SELECT password_hash FROM users WHERE email='ngo@example.org'").fetchone()[0]
+    conn.close()
+    assert stored.startswith("$argon2id$")
+    assert db.verify_user("ngo@example.org", "Ngo@123", "ngo")
+    assert db.verify_user("ngo@example.org", "Wrong@123", "ngo") is None
+
+
+def test_save_tokens_bulk_round_trip(temp_db):
+    tokens = [
+        {'token_id': f'T{i}', 'project_id': 'P1', 'project_name': 'Mangroves', 'credit_amount': 1.5 * i,
+         'vintage_year': 2024, 'status': 'active', 'current_owner': '0xabc'}
+        for i in range(50)
+    ]
+    db.save_tokens_bulk(tokens)
+    # Same token_id replaces the row
+    db.save_token({'token_id': 'T0', 'project_id': 'P1', 'status': 'retired'})
+
+    conn = db.get_conn()
+    rows = {row['token_id']: dict(row) for row in conn.execute("SELECT * FROM tokens")}
+    conn.close()
+    assert len(rows) == 50
+    assert rows['T7']['credit_amount'] == 10.5
+    assert rows['T7']['current_owner'] == '0xabc'
+    assert rows['T7']['retired_by'] is None
+    assert rows['T0']['status'] == 'retired'
+
+
+def test_save_transactions_bulk_round_trip(temp_db):
+    txs = [
+        {'id': f'TX{i}', 'token_id': f'T{i}', 'buyer_id': 'B1', 'credits_sold': 10.0,
+         'price_per_credit': 20.0, 'total_value': 200.0, 'status': 'completed'}
+        for i in range(20)
+    ]
+    db.save_transactions_bulk(txs)
+    db.save_transaction({'id': 'TX20', 'token_id': 'T20', 'buyer_id': 'B2'})
+
+    conn = db.get_conn()
+    rows = {row['tx_id']: dict(row) for row in conn.execute("SELECT * FROM transactions")}
+    conn.close()
+    assert len(rows) == 21
+    assert rows['TX3']['token_id'] == 'T3'
+    assert rows['TX3']['total_value'] == 200.0
+    assert rows['TX20']['buyer_id'] == 'B2'
+
+
+def test_save_tokens_bulk_is_one_transaction(temp_db):
+    with pytest.raises(Exception):
+        # sqlite3 cannot bind a dict, so the second row fails after the first was inserted
+        db.save_tokens_bulk([{'token_id': 'T1'}, {'token_id': 'T2', 'status': {}}])
+    conn = db.get_conn()
+    assert conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0] == 0
+    conn.close()
+
+
+def test_get_conn_reuses_closed_connections(temp_db):
+    conn = db.get_conn()
+    conn.execute("INSERT INTO tokens (token_id) VALUES ('uncommitted')")
+    conn.close()
+    conn.close()  # a second close must not pool the connection twice
+    assert db._pool.qsize() == 1
+
+    again = db.get_conn()
+    assert again is conn
+    # close() rolled back the uncommitted insert
+    assert again.execute("SELECT COUNT(*) FROM tokens").fetchone()[0] == 0
+    other = db.get_conn()
+    assert other is not again
+    again.close()
+    other.close()
+
+
+def test_thread_conn_is_per_thread(temp_db):
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(db._thread_conn()))
+    thread.start()
+    thread.join()
+
+    assert db._thread_conn() is db._thread_conn()
+    assert seen[0] is not db._thread_conn()
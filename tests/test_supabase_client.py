@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+
+import pytest
+
+from supabase_client import SupabaseClient, TokenBatchLoader
+
+
+def _recording_client(fail_token=None):
+    client = SupabaseClient()
+    applied = []
+    lock = threading.Lock()
+
+    def write(token_id, *args):
+        time.sleep(random.random() / 200)
+        with lock:
+            applied.append((token_id,) + args)
+        return token_id != fail_token
+
+    client.transfer_token = write
+    client.retire_token = write
+    return client, applied
+
+
+def test_transfer_tokens_bulk_keeps_per_token_order():
+    client, applied = _recording_client()
+    transfers = []
+    for n in range(20):
+        transfers.append({'token_id': f'T{n}', 'from_address': 'A', 'to_address': 'B', 'amount': 1})
+        transfers.append({'token_id': f'T{n}', 'from_address': 'B', 'to_address': 'C', 'amount': 1})
+
+    assert client.transfer_tokens_bulk(transfers) == [True] * len(transfers)
+    for n in range(20):
+        hops = [(a[1], a[2]) for a in applied if a[0] == f'T{n}']
+        assert hops == [('A', 'B'), ('B', 'C')]
+
+
+def test_retire_tokens_bulk_results_follow_input_order():
+    client, _ = _recording_client(fail_token='T1')
+    retirements = [
+        {'token_id': t, 'owner_address': 'A', 'reason': 'offset'} for t in ('T0', 'T1', 'T2', 'T1')
+    ]
+    assert client.retire_tokens_bulk(retirements) == [True, False, True, False]
+
+
+class _FakeTokenClient:
+    """Stands in for SupabaseClient.get_tokens_by_ids, recording each batched call"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    def get_tokens_by_ids(self, token_ids):
+        self.calls.append(sorted(token_ids))
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [{'token_id': token_id, 'owner': 'A'} for token_id in token_ids if token_id != 'missing']
+
+
+def _load_concurrently(loader, token_ids, timeout=5.0):
+    results, errors = {}, {}
+
+    def load(i, token_id):
+        try:
+            results[i] = loader.load(token_id, timeout=timeout)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=load, args=(i, t)) for i, t in enumerate(token_ids)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_token_loader_coalesces_concurrent_lookups():
+    client = _FakeTokenClient()
+    loader = TokenBatchLoader(client, batch_window=0.05)
+    results, errors = _load_concurrently(loader, ['T1', 'T2', 'T1', 'missing'])
+
+    assert not errors
+    assert client.calls == [['T1', 'T2', 'missing']]
+    assert results[0] == results[2] == {'token_id': 'T1', 'owner': 'A'}
+    assert results[3] is None
+
+    # Served from the cache within cache_ttl
+    assert loader.load('T2') == {'token_id': 'T2', 'owner': 'A'}
+    assert len(client.calls) == 1
+
+
+def test_token_loader_flushes_when_batch_is_full():
+    client = _FakeTokenClient()
+    loader = TokenBatchLoader(client, batch_window=10.0, max_batch_size=2)
+    results, errors = _load_concurrently(loader, ['T1', 'T2'])
+
+    assert not errors
+    assert client.calls == [['T1', 'T2']]
+
+
+def test_token_loader_fans_out_errors_to_every_waiter():
+    client = _FakeTokenClient(error=RuntimeError('db down'))
+    loader = TokenBatchLoader(client, batch_window=0.05)
+    results, errors = _load_concurrently(loader, ['T1', 'T2', 'T1'])
+
+    assert not results
+    assert len(errors) == 3
+    assert all(isinstance(e, RuntimeError) for e in errors.values())
+    assert len(client.calls) == 1
+
+
+def test_token_loader_times_out():
+    loader = TokenBatchLoader(_FakeTokenClient(delay=0.5), batch_window=0.01)
+    with pytest.raises(TimeoutError):
+        loader.load('T1', timeout=0.05)
+
+
+def test_get_token_info_omits_record_when_lookup_fails(monkeypatch):
+    from flask import Flask
+
+    import blockchain_routes
+
+    class FailingLoader:
+        def load(self, token_id):
+            raise TimeoutError()
+
+    monkeypatch.setattr(blockchain_routes.supabase_client, 'mock_mode', False)
+    monkeypatch.setattr(blockchain_routes, 'token_loader', FailingLoader())
+    monkeypatch.setattr(blockchain_routes.blockchain_mrv.smart_contract, 'get_token_info',
+                        lambda token_id: {'token_id': token_id})
+
+    app = Flask(__name__)
+    app.register_blueprint(blockchain_routes.blockchain_bp)
+    response = app.test_client().get('/api/blockchain/tokens/T1')
+
+    assert response.status_code == 200
+    assert response.get_json()['data'] == {'token_id': 'T1'}
+
+
+def test_get_token_info_etag_tracks_database_record(monkeypatch):
+    from flask import Flask
+
+    import blockchain_routes
+
+    record = {'token_id': 'T1', 'status': 'active'}
+
+    class RecordLoader:
+        def load(self, token_id):
+            return dict(record)
+
+    monkeypatch.setattr(blockchain_routes.supabase_client, 'mock_mode', False)
+    monkeypatch.setattr(blockchain_routes, 'token_loader', RecordLoader())
+    monkeypatch.setattr(blockchain_routes.blockchain_mrv.smart_contract, 'get_token_info',
+                        lambda token_id: {'token_id': token_id})
+
+    app = Flask(__name__)
+    app.register_blueprint(blockchain_routes.blockchain_bp)
+    client = app.test_client()
+    first = client.get('/api/blockchain/tokens/T1')
+    etag = first.headers['ETag']
+
+    assert client.get('/api/blockchain/tokens/T1', headers={'If-None-Match': etag}).status_code == 304
+
+    record['status'] = 'retired'
+    changed = client.get('/api/blockchain/tokens/T1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.get_json()['data']['database_record']['status'] == 'retired'
+    assert changed.headers['ETag'] != etag